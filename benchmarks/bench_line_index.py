@@ -0,0 +1,111 @@
+"""Scan time on a synthetic 50k-line Java file, before and after position tracking.
+
+    python benchmarks/bench_line_index.py --lines 50000 --comment-every 25
+
+"before" is the original translator4_jp.py scan loop (JavaDoc and block
+comment passes with ``content[:match.start()].count("\\n")``, then line
+comment and string passes per line, then the dedup dict). "after" is
+extractors.extract_buffer_spans() on the file's UTF-8 bytes, the path the
+scanner runs, which resolves positions with a forward-only LineCursor.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from translatorprog.extractors import LineCursor, extract_buffer_spans  # noqa: E402
+
+JAPANESE_REGEX = re.compile(r'[\u3040-\u30ff\u4e00-\u9faf]')
+STRING_REGEX = re.compile(r'"([^"\\]*(?:\\.[^"\\]*)*)"')
+LINE_COMMENT_REGEX = re.compile(r'//(.*)')
+BLOCK_COMMENT_REGEX = re.compile(r'/\*(?!\*)([\s\S]*?)\*/')
+JAVADOC_REGEX = re.compile(r'/\*\*([\s\S]*?)\*/')
+
+
+def make_java(lines, comment_every):
+    out = ["package com.example.generated;", "", "public class Generated {"]
+    i = 0
+    while len(out) < lines - 1:
+        if i % comment_every == 0:
+            out += ["    /**", f"     * 生成されたメソッド{i}の説明。", "     */"]
+        elif i % comment_every == comment_every // 2:
+            out += ["    /* ブロックコメント */"]
+        out.append(f'    public String method{i}() {{ return "値{i}"; }} // 行コメント{i}')
+        i += 1
+    out.append("}")
+    return "\n".join(out) + "\n"
+
+
+def legacy_scan(content):
+    rows = []
+    for regex in (JAVADOC_REGEX, BLOCK_COMMENT_REGEX):
+        for match in regex.finditer(content):
+            start_line = content[:match.start()].count("\n") + 1
+            for offset, line in enumerate(match.group(1).splitlines()):
+                text = line.strip(" *")
+                if JAPANESE_REGEX.search(text):
+                    rows.append((start_line + offset, text))
+    for line_no, line in enumerate(content.splitlines(), start=1):
+        m = LINE_COMMENT_REGEX.search(line)
+        if m and JAPANESE_REGEX.search(m.group(1).strip()):
+            rows.append((line_no, m.group(1).strip()))
+        for match in STRING_REGEX.findall(line):
+            if JAPANESE_REGEX.search(match):
+                rows.append((line_no, match))
+    return list(dict.fromkeys(rows))
+
+
+def cursor_lines(data, offsets):
+    cursor = LineCursor(data)
+    return [cursor.position(o)[0] for o in offsets]
+
+
+def lexer_scan(data):
+    return [(span.line, span.text) for span in extract_buffer_spans(data, "Generated.java")]
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=50000)
+    parser.add_argument("--comment-every", type=int, default=25)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    content = make_java(args.lines, args.comment_every)
+    data = content.encode("utf-8")
+    offsets = [m.start() for m in JAVADOC_REGEX.finditer(content)]
+    byte_offsets = [len(content[:o].encode("utf-8")) for o in offsets]
+
+    prefix_count, _ = best_of(lambda: [content[:o].count("\n") + 1 for o in offsets], args.repeat)
+    line_cursor, _ = best_of(lambda: cursor_lines(data, byte_offsets), args.repeat)
+    before, legacy_rows = best_of(lambda: legacy_scan(content), args.repeat)
+    after, lexer_rows = best_of(lambda: lexer_scan(data), args.repeat)
+
+    print(json.dumps({
+        "lines": content.count("\n"),
+        "javadoc_comments": len(offsets),
+        "line_lookup_prefix_count_s": round(prefix_count, 4),
+        "line_lookup_line_cursor_s": round(line_cursor, 4),
+        "scan_before_s": round(before, 4),
+        "scan_after_s": round(after, 4),
+        "speedup": round(before / after, 1),
+        "rows_before": len(legacy_rows),
+        "rows_after": len(lexer_rows),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
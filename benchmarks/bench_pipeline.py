@@ -0,0 +1,160 @@
+"""Time every phase of scan -> translate -> apply on a synthetic project tree.
+
+    python benchmarks/bench_pipeline.py --files 2000 --density 0.05 --output results.json
+    python benchmarks/bench_pipeline.py --baseline results.json --tolerance 0.25
+
+Generates a reproducible tree (see synthetic_corpus.py), then times, each
+on its own: walk (discover_files), extract (scan_files), translate
+(BatchTranslator with the offline FakeBackend), report (streaming CSV),
+backup (LazyBackup copies) and apply (apply_rows, excluding backup time).
+Results are printed as JSON and optionally written to ``--output``. With
+``--baseline``, any phase slower than the baseline by more than
+``--tolerance`` fails the run with status 1.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic_corpus import generate_tree  # noqa: E402
+from translatorprog.apply_engine import apply_rows  # noqa: E402
+from translatorprog.backup import LazyBackup  # noqa: E402
+from translatorprog.pipeline import DEFAULT_EXTENSIONS, DEFAULT_IGNORE_DIRS  # noqa: E402
+from translatorprog.report_writer import ReportRow, StreamingReportWriter, read_report  # noqa: E402
+from translatorprog.scanner import discover_files, scan_files  # noqa: E402
+from translatorprog.translation_backends import FakeBackend  # noqa: E402
+from translatorprog.translation_engine import BatchTranslator  # noqa: E402
+
+PHASES = ("walk", "extract", "translate", "report", "backup", "apply")
+
+
+class TimedBackup(LazyBackup):
+    """LazyBackup that adds up the time spent copying originals."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.seconds = 0.0
+
+    def save_original(self, path):
+        start = time.perf_counter()
+        super().save_original(path)
+        self.seconds += time.perf_counter() - start
+
+
+def run(root, args):
+    project = os.path.join(root, "project")
+    report_csv = os.path.join(root, "report.csv")
+    timings = {}
+
+    start = time.perf_counter()
+    paths = list(discover_files(project, DEFAULT_EXTENSIONS, set(DEFAULT_IGNORE_DIRS)))
+    timings["walk"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scanned = list(scan_files(paths, workers=args.workers))
+    timings["extract"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    engine = BatchTranslator(FakeBackend(latency=args.latency, seed=args.seed),
+                             concurrency=args.concurrency, rate_limit=args.rate_limit)
+    for _, spans, _ in scanned:
+        for span in spans:
+            engine.add(span.text)
+    translations = engine.translate_all()
+    engine.close()
+    timings["translate"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with StreamingReportWriter(report_csv) as report:
+        for path, spans, file_hash in scanned:
+            report.add_file(path, [ReportRow(path, span.line, span.column, span.start, span.end,
+                                             span.text, translations[span.text], file_hash)
+                                   for span in spans])
+    timings["report"] = time.perf_counter() - start
+
+    backup = TimedBackup(os.path.join(root, "backup"), project)
+    start = time.perf_counter()
+    files_written, edits, rejected = apply_rows(read_report(report_csv), backup)
+    timings["backup"] = backup.seconds
+    timings["apply"] = time.perf_counter() - start - backup.seconds
+
+    counts = {
+        "files_scanned": len(paths),
+        "spans": report.rows_written,
+        "unique_texts": len(translations),
+        "translate_requests": engine.requests,
+        "files_written": files_written,
+        "edits": edits,
+        "rejected": rejected,
+    }
+    return {phase: round(timings[phase], 4) for phase in PHASES}, counts
+
+
+def regressions(phases, baseline, tolerance):
+    """Phases more than ``tolerance`` slower than in ``baseline``."""
+    slower = {}
+    for phase, seconds in phases.items():
+        before = baseline.get("phases", {}).get(phase)
+        if before and seconds > before * (1 + tolerance):
+            slower[phase] = {"baseline_s": before, "now_s": seconds}
+    return slower
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=1000)
+    parser.add_argument("--lines", type=int, default=200)
+    parser.add_argument("--density", type=float, default=0.05,
+                        help="chance that a comment, literal or value is Japanese")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="extraction processes (default: one per CPU core)")
+    parser.add_argument("--latency", type=float, default=0.0, help="fake backend seconds per request")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--rate-limit", type=float, default=1000.0, help="requests per second")
+    parser.add_argument("--output", help="also write the results to this JSON file")
+    parser.add_argument("--baseline", help="results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown per phase against --baseline (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="bench-pipeline-")
+    try:
+        corpus = generate_tree(os.path.join(root, "project"), args.files, args.lines,
+                               args.density, args.seed)
+        phases, counts = run(root, args)
+    finally:
+        shutil.rmtree(root)
+
+    results = {
+        "config": {key: getattr(args, key) for key in
+                   ("files", "lines", "density", "seed", "workers", "latency", "concurrency")},
+        "environment": {"python": platform.python_version(), "platform": platform.platform(),
+                        "cpus": os.cpu_count()},
+        "corpus": corpus,
+        "counts": counts,
+        "phases": phases,
+        "total_s": round(sum(phases.values()), 4),
+    }
+    status = 0
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            results["regressions"] = regressions(phases, json.load(f), args.tolerance)
+        status = 1 if results["regressions"] else 0
+
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
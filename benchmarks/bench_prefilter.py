@@ -0,0 +1,82 @@
+"""Scan time on a mostly-ASCII synthetic tree, with and without the prefilter.
+
+    python benchmarks/bench_prefilter.py --files 2000 --japanese-ratio 0.02
+
+Builds a temporary tree of Java files where only ``--japanese-ratio`` of
+them contain Japanese, then runs scanner.scan_files() in-process over it
+twice: once lexing every file, once skipping files whose bytes hold no
+Japanese (prefilter.contains_japanese_bytes).
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from translatorprog.scanner import discover_files, scan_files  # noqa: E402
+
+
+def make_java(index, lines, japanese):
+    out = ["package com.example.generated;", "", f"public class Generated{index} {{"]
+    for i in range(lines):
+        if japanese and i % 20 == 0:
+            out.append(f'    public String method{i}() {{ return "値{i}"; }} // 行コメント')
+        else:
+            out.append(f'    public String method{i}() {{ return "value{i}"; }} // line comment {i}')
+    out.append("}")
+    return "\n".join(out) + "\n"
+
+
+def make_tree(root, files, lines, ratio):
+    every = max(1, round(1 / ratio)) if ratio > 0 else 0
+    for index in range(files):
+        folder = os.path.join(root, f"pkg{index // 100}")
+        os.makedirs(folder, exist_ok=True)
+        japanese = every and index % every == 0
+        with open(os.path.join(folder, f"Generated{index}.java"), "w", encoding="utf-8") as f:
+            f.write(make_java(index, lines, japanese))
+
+
+def timed_scan(paths, prefilter, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = sum(len(spans) for _, spans, _ in scan_files(paths, workers=1, prefilter=prefilter))
+        timings.append(time.perf_counter() - start)
+    return min(timings), rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--lines", type=int, default=300)
+    parser.add_argument("--japanese-ratio", type=float, default=0.02)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="bench-prefilter-")
+    try:
+        make_tree(root, args.files, args.lines, args.japanese_ratio)
+        paths = list(discover_files(root, (".java",)))
+        before, rows_before = timed_scan(paths, False, args.repeat)
+        after, rows_after = timed_scan(paths, True, args.repeat)
+    finally:
+        shutil.rmtree(root)
+
+    print(json.dumps({
+        "files": len(paths),
+        "japanese_ratio": args.japanese_ratio,
+        "scan_without_prefilter_s": round(before, 4),
+        "scan_with_prefilter_s": round(after, 4),
+        "speedup": round(before / after, 1),
+        "rows_before": rows_before,
+        "rows_after": rows_after,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
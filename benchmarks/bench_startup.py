@@ -0,0 +1,88 @@
+"""Startup cost of a scan-only run, checked against a time budget.
+
+    python benchmarks/bench_startup.py --budget-ms 100
+
+Runs ``python -m translatorprog scan`` in a fresh interpreter over a tiny
+tree (the pre-commit case, where startup dominates) and reports the median
+wall time above a bare ``python -c pass``. It also lists which heavy
+modules the scan loaded; a scan without --translate must not import any
+of them. Exits with status 1 if the budget is exceeded or one was loaded.
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules only the translate, OCR, Excel or multi-process stages need
+HEAVY_MODULES = ("deepl", "PIL", "pytesseract", "openpyxl", "sqlite3",
+                 "multiprocessing", "concurrent.futures", "translatorprog.translation_engine")
+
+LOADED_SCRIPT = """
+import json, sys
+from translatorprog import cli
+cli.main(sys.argv[1:])
+print(json.dumps([m for m in {heavy!r} if m in sys.modules]))
+"""
+
+
+def make_tree(root):
+    os.makedirs(os.path.join(root, "src"))
+    with open(os.path.join(root, "src", "Hello.java"), "w", encoding="utf-8") as f:
+        f.write('class Hello {\n    String s = "こんにちは"; // 挨拶\n}\n')
+    with open(os.path.join(root, "src", "app.properties"), "w", encoding="utf-8") as f:
+        f.write("app.title=Hello\n")
+
+
+def median_run(command, repeat, env):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, check=True, env=env, stdout=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=100.0,
+                        help="allowed wall time above a bare interpreter start")
+    parser.add_argument("--repeat", type=int, default=15)
+    args = parser.parse_args()
+
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    root = tempfile.mkdtemp(prefix="bench-startup-")
+    try:
+        make_tree(os.path.join(root, "project"))
+        scan = ["scan", os.path.join(root, "project"), "--report", os.path.join(root, "report.csv"),
+                "--workers", "1", "--no-manifest"]
+        baseline = median_run([sys.executable, "-c", "pass"], args.repeat, env)
+        total = median_run([sys.executable, "-m", "translatorprog", *scan], args.repeat, env)
+        script = LOADED_SCRIPT.format(heavy=HEAVY_MODULES)
+        output = subprocess.run([sys.executable, "-c", script, *scan], check=True, env=env,
+                                capture_output=True, text=True).stdout
+        loaded = json.loads(output.strip().splitlines()[-1])
+    finally:
+        shutil.rmtree(root)
+
+    startup_ms = (total - baseline) * 1000
+    ok = startup_ms <= args.budget_ms and not loaded
+    print(json.dumps({
+        "interpreter_ms": round(baseline * 1000, 1),
+        "scan_ms": round(total * 1000, 1),
+        "startup_over_interpreter_ms": round(startup_ms, 1),
+        "budget_ms": args.budget_ms,
+        "heavy_modules_loaded": loaded,
+        "ok": ok,
+    }, indent=2))
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Measure translation throughput against the local mock DeepL server.
+
+    python benchmarks/bench_translate.py --texts 5000 --latency 0.1 --rate-429 0.1 --concurrency 1 4 8
+
+By default a small urllib client is used so the benchmark runs without the
+``deepl`` package; pass ``--client deepl`` to drive the real library against
+the mock server instead (note that deepl retries 429s internally as well).
+``--client fake`` skips HTTP entirely and uses translation_backends.FakeBackend
+with the same latency and 429 settings.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import urllib.error
+import urllib.request
+from types import SimpleNamespace
+from urllib.parse import urlencode
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.mock_deepl_server import MockDeepLServer  # noqa: E402
+from translatorprog.translation_backends import DeepLBackend, FakeBackend  # noqa: E402
+from translatorprog.translation_engine import BatchTranslator  # noqa: E402
+
+
+class TooManyRequestsException(Exception):
+    http_status_code = 429
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class MockClient:
+    """Minimal DeepL-compatible client for the mock server."""
+
+    def __init__(self, server_url):
+        self.server_url = server_url
+
+    def translate_text(self, texts, source_lang=None, target_lang=None):
+        params = [("text", t) for t in texts] + [("target_lang", target_lang)]
+        if source_lang:
+            params.append(("source_lang", source_lang))
+        request = urllib.request.Request(f"{self.server_url}/v2/translate",
+                                         data=urlencode(params).encode("utf-8"))
+        try:
+            with urllib.request.urlopen(request) as response:
+                payload = json.load(response)
+        except urllib.error.HTTPError as e:
+            if e.code == 429:
+                raise TooManyRequestsException("Too many requests", e.headers.get("Retry-After"))
+            raise
+        return [SimpleNamespace(text=t["text"]) for t in payload["translations"]]
+
+
+def make_backend(kind, server_url):
+    if kind == "deepl":
+        return DeepLBackend("mock:fx", server_url=server_url)
+    return DeepLBackend(client=MockClient(server_url))
+
+
+def run(args, concurrency):
+    server = None
+    if args.client == "fake":
+        backend = FakeBackend(latency=args.latency, rate_429=args.rate_429,
+                              retry_after=args.retry_after, seed=args.seed)
+    else:
+        server = MockDeepLServer(latency=args.latency, rate_429=args.rate_429,
+                                 retry_after=args.retry_after, seed=args.seed).start()
+        backend = make_backend(args.client, server.url)
+    try:
+        engine = BatchTranslator(backend, concurrency=concurrency, rate_limit=args.rate_limit)
+        start = time.perf_counter()
+        for i in range(args.texts):
+            engine.add(f"テキスト{i}")
+        engine.translate_all()
+        elapsed = time.perf_counter() - start
+        engine.close()
+    finally:
+        if server is not None:
+            server.stop()
+    return {
+        "concurrency": concurrency,
+        "texts": len(engine.translations),
+        "seconds": round(elapsed, 3),
+        "texts_per_second": round(len(engine.translations) / elapsed, 1),
+        "requests": engine.requests,
+        "retries": engine.retries,
+        "server_throttled": server.stats["throttled"] if server else backend.throttled,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--texts", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--rate-429", type=float, default=0.1)
+    parser.add_argument("--retry-after", type=int, default=0)
+    parser.add_argument("--rate-limit", type=float, default=50.0, help="requests per second")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--client", choices=("mock", "deepl", "fake"), default="mock")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for concurrency in args.concurrency:
+        print(json.dumps(run(args, concurrency)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Local stand-in for the DeepL v2 API used by the translation benchmarks.
+
+Injects a fixed latency per request and answers a configurable fraction of
+requests with ``429 Too Many Requests`` so the worker pool's rate limiting
+and retry behaviour can be measured offline. Point ``deepl.Translator`` at it
+with ``server_url=server.url``.
+"""
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+
+class MockDeepLHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, payload, headers=()):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def read_params(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length).decode("utf-8")
+        if self.headers.get("Content-Type", "").startswith("application/json"):
+            params = json.loads(raw or "{}")
+            texts = params.get("text", [])
+            return (texts if isinstance(texts, list) else [texts]), params.get("target_lang")
+        params = parse_qs(raw)
+        return params.get("text", []), params.get("target_lang", [None])[0]
+
+    def do_GET(self):
+        if self.path.startswith("/v2/usage"):
+            stats = self.server.stats
+            self.send_json(200, {"character_count": stats["characters"],
+                                 "character_limit": 500000})
+        elif self.path.startswith("/v2/languages"):
+            self.send_json(200, [{"language": "JA", "name": "Japanese"},
+                                 {"language": "EN-US", "name": "English (American)"}])
+        else:
+            self.send_json(404, {"message": "Not found"})
+
+    def do_POST(self):
+        server = self.server
+        texts, target_lang = self.read_params()
+        time.sleep(server.latency)
+        with server.lock:
+            server.stats["requests"] += 1
+            throttled = server.random.random() < server.rate_429
+            if throttled:
+                server.stats["throttled"] += 1
+            else:
+                server.stats["texts"] += len(texts)
+                server.stats["characters"] += sum(len(t) for t in texts)
+        if throttled:
+            self.send_json(429, {"message": "Too many requests"},
+                           headers=[("Retry-After", str(server.retry_after))] if server.retry_after else ())
+            return
+        self.send_json(200, {"translations": [
+            {"detected_source_language": "JA", "text": f"[{target_lang}] {text}"} for text in texts
+        ]})
+
+
+class MockDeepLServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, latency=0.05, rate_429=0.1, retry_after=0, seed=0, port=0):
+        super().__init__(("127.0.0.1", port), MockDeepLHandler)
+        self.latency = latency
+        self.rate_429 = rate_429
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "throttled": 0, "texts": 0, "characters": 0}
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+if __name__ == "__main__":
+    server = MockDeepLServer(port=8765)
+    print(f"Mock DeepL server listening on {server.url}")
+    server.serve_forever()
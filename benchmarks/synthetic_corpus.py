@@ -0,0 +1,179 @@
+"""Reproducible synthetic project trees with Japanese text for the benchmarks.
+
+    python benchmarks/synthetic_corpus.py OUT_DIR --files 500 --lines 200 --density 0.05
+
+Every extension the extractors support is covered: Java, Groovy,
+TypeScript and Dart sources with JavaDoc/doc comments, block comments,
+``//`` comments and string literals; JSON and ARB resources; YAML and
+``.properties`` values and comments; XML and HTML text, attributes and
+comments. ``--density`` is the chance that any
+one comment, literal or value is Japanese. The same seed always produces
+the same tree.
+"""
+import argparse
+import json
+import os
+import random
+
+# Extension -> share of the generated files
+EXTENSION_WEIGHTS = {
+    ".java": 30, ".groovy": 5, ".ts": 15, ".dart": 15, ".json": 5, ".arb": 5,
+    ".yml": 10, ".yaml": 5, ".properties": 10, ".xml": 5, ".html": 5,
+}
+
+JAPANESE_WORDS = ["ユーザー", "ログイン", "設定", "保存", "削除", "確認", "エラー", "画面",
+                  "更新", "検索", "一覧", "登録", "完了", "失敗", "入力", "必須", "項目",
+                  "パスワード", "メール", "送信", "取得", "処理", "注文", "商品", "日付"]
+ENGLISH_WORDS = ["user", "login", "settings", "save", "delete", "confirm", "error", "screen",
+                 "update", "search", "list", "register", "done", "failed", "input", "required",
+                 "field", "password", "mail", "send", "fetch", "process", "order", "item", "date"]
+
+
+class TextSource:
+    """Japanese or English phrases, Japanese with probability ``density``."""
+
+    def __init__(self, rng, density):
+        self.rng = rng
+        self.density = density
+
+    def phrase(self, words=3):
+        if self.rng.random() < self.density:
+            return "".join(self.rng.choice(JAPANESE_WORDS) for _ in range(words)) + "。"
+        return " ".join(self.rng.choice(ENGLISH_WORDS) for _ in range(words))
+
+    def key(self):
+        return ".".join(self.rng.choice(ENGLISH_WORDS) for _ in range(2)) + str(self.rng.randrange(1000))
+
+
+# =============================
+# GENERATORS
+# =============================
+def c_style(text, index, lines, ext):
+    """Class-like source with doc, block and line comments and string literals."""
+    out = [f"// Generated file {index}"]
+    if ext == ".dart":
+        out.append(f"class Generated{index} {{")
+    elif ext == ".ts":
+        out.append(f"export class Generated{index} {{")
+    else:
+        out += ["package com.example.generated;", "", f"public class Generated{index} {{"]
+    i = 0
+    while len(out) < lines:
+        choice = i % 5
+        if choice == 0:
+            doc = ["    /**", f"     * {text.phrase()}", f"     * @param value {text.phrase(2)}", "     */"]
+            if ext == ".dart":
+                doc = [f"  /// {text.phrase()}", f"  /// {text.phrase(2)}"]
+            out += doc
+        elif choice == 1:
+            out += ["    /*", f"     * {text.phrase()}", "     */"]
+        elif choice == 2:
+            out.append(f"    // {text.phrase()}")
+        quote = "'" if ext == ".dart" else '"'
+        out.append(f"    String method{i}() {{ return {quote}{text.phrase()}{quote}; }}")
+        i += 1
+    out.append("}")
+    return out
+
+
+def json_resource(text, index, lines, ext):
+    entries = {}
+    if ext == ".arb":
+        entries["@@locale"] = "ja"
+    for i in range(max(1, lines - 2)):
+        entries[f"{text.key()}_{i}"] = text.phrase()
+    return json.dumps(entries, ensure_ascii=False, indent=2).splitlines()
+
+
+def yaml_config(text, index, lines, ext):
+    out = [f"# {text.phrase()}", "app:"]
+    i = 0
+    while len(out) < lines:
+        if i % 4 == 0:
+            out.append(f"  # {text.phrase()}")
+        if i % 3 == 0:
+            out.append(f'  key{i}: "{text.phrase()}"')
+        else:
+            out.append(f"  key{i}: {text.phrase()}")
+        i += 1
+    return out
+
+
+def properties(text, index, lines, ext):
+    out = [f"# {text.phrase()}"]
+    i = 0
+    while len(out) < lines:
+        if i % 4 == 0:
+            out.append(f"! {text.phrase()}")
+        out.append(f"{text.key()}.{i}={text.phrase()}")
+        i += 1
+    return out
+
+
+def markup(text, index, lines, ext):
+    """XML resources or an HTML page with comments, attributes and text nodes."""
+    if ext == ".xml":
+        out = ['<?xml version="1.0" encoding="utf-8"?>', f"<!-- {text.phrase()} -->", "<resources>"]
+        close = "</resources>"
+    else:
+        out = ["<!DOCTYPE html>", "<html>", f"<head><title>{text.phrase()}</title></head>", "<body>"]
+        close = "</body>\n</html>"
+    i = 0
+    while len(out) < lines:
+        if i % 4 == 0:
+            out.append(f"  <!-- {text.phrase()} -->")
+        if ext == ".xml":
+            out.append(f'  <string name="{text.key()}_{i}">{text.phrase()}</string>')
+        else:
+            out.append(f'  <p title="{text.phrase(2)}">{text.phrase()}</p>')
+        i += 1
+    out.append(close)
+    return out
+
+
+GENERATORS = {
+    ".java": c_style, ".groovy": c_style, ".ts": c_style, ".dart": c_style,
+    ".json": json_resource, ".arb": json_resource,
+    ".yml": yaml_config, ".yaml": yaml_config, ".properties": properties,
+    ".xml": markup, ".html": markup,
+}
+
+
+def generate_tree(root, files=500, lines=200, density=0.05, seed=0):
+    """Write ``files`` files of about ``lines`` lines each under ``root``.
+
+    Returns {"files": n, "lines": n, "bytes": n, "by_extension": {ext: n}}.
+    """
+    rng = random.Random(seed)
+    text = TextSource(rng, density)
+    extensions = list(EXTENSION_WEIGHTS)
+    weights = list(EXTENSION_WEIGHTS.values())
+    stats = {"files": 0, "lines": 0, "bytes": 0, "by_extension": {}}
+    for index in range(files):
+        ext = rng.choices(extensions, weights)[0]
+        folder = os.path.join(root, f"module{index % 10}", "src", f"pkg{index // 100}")
+        os.makedirs(folder, exist_ok=True)
+        content = "\n".join(GENERATORS[ext](text, index, lines, ext)) + "\n"
+        data = content.encode("utf-8")
+        with open(os.path.join(folder, f"generated{index}{ext}"), "wb") as f:
+            f.write(data)
+        stats["files"] += 1
+        stats["lines"] += content.count("\n")
+        stats["bytes"] += len(data)
+        stats["by_extension"][ext] = stats["by_extension"].get(ext, 0) + 1
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("root")
+    parser.add_argument("--files", type=int, default=500)
+    parser.add_argument("--lines", type=int, default=200)
+    parser.add_argument("--density", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print(json.dumps(generate_tree(args.root, args.files, args.lines, args.density, args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,11 @@
-import os
-import re
-import csv
-import shutil
-import deepl
+"""Scan, translate and apply in one go, letting DeepL detect the source language.
+
+Thin wrapper around the translatorprog CLI, equivalent to:
+
+    python -m translatorprog scan PROJECT --translate --source-lang auto --no-postprocess
+    python -m translatorprog apply --project PROJECT
+"""
+from translatorprog import cli
 
 # =============================
 # CONFIGURATION
@@ -14,82 +17,14 @@ BACKUP_FOLDER = "backup_project"  # Backup folder before translation
 FILE_EXTENSIONS = (".java", ".properties", ".xml", ".html", ".json")  # Files to scan
 TARGET_LANG = "EN-US"  # Translate to English
 
-# =============================
-# INITIALIZE DEEPL TRANSLATOR
-# =============================
-translator = deepl.Translator(API_KEY)
-
-# =============================
-# FUNCTION TO DETECT JAPANESE
-# =============================
-# Matches Hiragana, Katakana, Kanji
-japanese_regex = re.compile(r'[\u3040-\u30ff\u4e00-\u9faf]+')
-
-def find_japanese_text(text):
-    return japanese_regex.findall(text)
-
-# =============================
-# CREATE BACKUP
-# =============================
-if not os.path.exists(BACKUP_FOLDER):
-    shutil.copytree(PROJECT_PATH, BACKUP_FOLDER)
-    print(f"Backup created at '{BACKUP_FOLDER}'")
-
-# =============================
-# SCAN FILES AND CREATE REPORT
-# =============================
-report_rows = []
-
-for root, dirs, files in os.walk(PROJECT_PATH):
-    for file in files:
-        if file.endswith(FILE_EXTENSIONS):
-            file_path = os.path.join(root, file)
-            with open(file_path, "r", encoding="utf-8") as f:
-                for i, line in enumerate(f, start=1):
-                    matches = find_japanese_text(line)
-                    for match in matches:
-                        report_rows.append({
-                            "file_path": file_path,
-                            "line_number": i,
-                            "japanese_text": match
-                        })
-
-# Save report
-with open(REPORT_CSV, "w", newline="", encoding="utf-8") as csvfile:
-    fieldnames = ["file_path", "line_number", "japanese_text"]
-    writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-    writer.writeheader()
-    for row in report_rows:
-        writer.writerow(row)
-
-print(f"Report generated: {REPORT_CSV}")
-print(f"Total Japanese snippets found: {len(report_rows)}")
-
-# =============================
-# TRANSLATE FILES USING DEEPL
-# =============================
-def translate_text(text):
-    try:
-        return translator.translate_text(text, target_lang=TARGET_LANG).text
-    except Exception as e:
-        print(f"Error translating '{text}': {e}")
-        return text
-
-for row in report_rows:
-    file_path = row["file_path"]
-    original_text = row["japanese_text"]
-
-    # Read file content
-    with open(file_path, "r", encoding="utf-8") as f:
-        content = f.read()
 
-    # Replace all occurrences of the Japanese snippet
-    translated_text = translate_text(original_text)
-    content = content.replace(original_text, translated_text)
+def main():
+    cli.main(["scan", PROJECT_PATH, "--report", REPORT_CSV, "--translate",
+              "--extensions", *FILE_EXTENSIONS, "--auth-key", API_KEY,
+              "--source-lang", "auto", "--target-lang", TARGET_LANG, "--no-postprocess"])
+    cli.main(["apply", "--report", REPORT_CSV, "--backup", BACKUP_FOLDER, "--project", PROJECT_PATH])
+    print("All Japanese text translated successfully!")
 
-    # Save back to file
-    with open(file_path, "w", encoding="utf-8") as f:
-        f.write(content)
-    print(f"Translated '{original_text}' in {file_path}")
 
-print("All Japanese text translated successfully!")
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,12 @@
-from PIL import Image, ImageDraw, ImageFont
-import pytesseract
-import deepl
-import csv
 import os
 
+from translatorprog.image_render import render_images
+from translatorprog.image_report import ImageReportWriter, read_image_report
+from translatorprog.ocr import list_images, translate_images
+
+# PIL, pytesseract and deepl are imported inside the steps that use them, so
+# a run over a folder without images returns before loading any of them.
+
 # ==============================
 # CONFIGURATION
 # ==============================
@@ -13,86 +16,58 @@ OUTPUT_FOLDER = "translated_images" # Folder to save translated images
 REPORT_CSV = "japanese_text_report.csv"
 
 DEEPL_API_KEY = "YOUR_DEEPL_API_KEY"
+TRANSLATION_BACKEND = "deepl"       # "deepl", "memory" (translation memory only, offline) or "fake"
+TRANSLATION_MEMORY = "translation_memory.sqlite3"  # shared with the source scanners; None = off
 FONT_PATH = "arial.ttf"             # Path to TTF font
 FONT_SIZE = 40
+OCR_WORKERS = None                  # OCR processes; None = one per CPU core
+OCR_GROUPING = "line"               # translate each "word", "line" or "paragraph"
+RENDER_WORKERS = None               # rendering processes; None = one per CPU core
+DEDUP_THRESHOLD = 2                 # reuse OCR/translations of look-alike images and regions; None = off
 
-os.makedirs(OUTPUT_FOLDER, exist_ok=True)
-
-# ==============================
-# INITIALIZE TRANSLATOR
-# ==============================
-translator = deepl.Translator(DEEPL_API_KEY)
-
-# ==============================
-# 1. GENERATE REPORT (OCR + TRANSLATION)
-# ==============================
-report_rows = []
-
-for filename in os.listdir(IMAGES_FOLDER):
-    if filename.lower().endswith((".png", ".jpg", ".jpeg")):
-        image_path = os.path.join(IMAGES_FOLDER, filename)
-        img = Image.open(image_path)
-
-        # OCR with bounding boxes
-        data = pytesseract.image_to_data(img, lang='jpn', output_type=pytesseract.Output.DICT)
-        n_boxes = len(data['level'])
-
-        for i in range(n_boxes):
-            text = data['text'][i].strip()
-            if text == "":
-                continue
-
-            # Bounding box coordinates
-            x, y, w, h = data['left'][i], data['top'][i], data['width'][i], data['height'][i]
-
-            # Translate text using DeepL
-            try:
-                translation = translator.translate_text(text, source_lang="JA", target_lang="EN-US").text
-            except Exception as e:
-                translation = text
-                print(f"Translation failed for '{text}': {e}")
-
-            # Add to report
-            report_rows.append([filename, x, y, w, h, text, translation])
-
-# Save CSV report
-with open(REPORT_CSV, mode="w", newline="", encoding="utf-8") as csvfile:
-    writer = csv.writer(csvfile)
-    writer.writerow(["Image File", "X", "Y", "Width", "Height", "Japanese Text", "English Translation"])
-    writer.writerows(report_rows)
-
-print(f"Report generated: {REPORT_CSV}")
-print("Please validate the report before replacing text in images.\n")
 
 # ==============================
 # 2. REPLACE TEXT IN IMAGES AFTER VALIDATION
 # ==============================
-
-# Prompt user to continue
-proceed = input("Do you want to replace Japanese text with English in images? (y/n): ").lower()
-if proceed != "y":
-    print("Process terminated. You can edit the report and rerun.")
-    exit()
-
-# Process images
-for row in report_rows:
-    filename, x, y, w, h, japanese_text, english_text = row
-    image_path = os.path.join(IMAGES_FOLDER, filename)
-    output_path = os.path.join(OUTPUT_FOLDER, filename)
-
-    # Open image
-    img = Image.open(image_path)
-    draw = ImageDraw.Draw(img)
-
-    # Cover original Japanese text
-    draw.rectangle([x, y, x + w, y + h], fill="white")
-
-    # Draw English translation
-    font = ImageFont.truetype(FONT_PATH, FONT_SIZE)
-    draw.text((x, y), english_text, fill="black", font=font)
-
-    # Save translated image
-    img.save(output_path)
-    print(f"Translated image saved: {output_path}")
-
-print("\nAll images processed successfully!")
+def replace_text():
+    """Draw the reviewed translations from REPORT_CSV onto copies of the images.
+
+    The report is streamed back from disk, so edits made during review are
+    used and no rows are held in memory.
+    """
+    rows = read_image_report(REPORT_CSV)
+    for output_path in render_images(rows, IMAGES_FOLDER, OUTPUT_FOLDER, FONT_PATH, FONT_SIZE,
+                                     fit=False, workers=RENDER_WORKERS):
+        print(f"Translated image saved: {output_path}")
+
+
+def main():
+    filenames = list_images(IMAGES_FOLDER)
+    if not filenames:
+        print(f"No images found in {IMAGES_FOLDER}")
+        return
+
+    # OCR with bounding boxes, streamed into the CSV report
+    with ImageReportWriter(csv_path=REPORT_CSV) as report:
+        paths = [os.path.join(IMAGES_FOLDER, filename) for filename in filenames]
+        engine = translate_images(paths, report, backend=TRANSLATION_BACKEND, auth_key=DEEPL_API_KEY,
+                                  memory_path=TRANSLATION_MEMORY, workers=OCR_WORKERS,
+                                  level=OCR_GROUPING, dedup_threshold=DEDUP_THRESHOLD)
+    print(f"Translated {len(engine.translations)} unique texts ({engine.memory_hits} from "
+          f"translation memory, {engine.requests} requests)")
+
+    print(f"Report generated: {REPORT_CSV}")
+    print("Please validate the report before replacing text in images.\n")
+
+    # Prompt user to continue
+    proceed = input("Do you want to replace Japanese text with English in images? (y/n): ").lower()
+    if proceed != "y":
+        print("Process terminated. You can edit the report and rerun.")
+        return
+
+    replace_text()
+    print("\nAll images processed successfully!")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,11 @@
-from PIL import Image, ImageDraw, ImageFont
-import pytesseract
-import deepl
 import os
-from openpyxl import Workbook
-from openpyxl.styles import PatternFill
+
+from translatorprog.image_render import render_images
+from translatorprog.image_report import ImageReportWriter, read_image_report
+from translatorprog.ocr import list_images, translate_images
+
+# PIL, pytesseract, deepl and openpyxl are imported inside the steps that
+# use them, so a run over a folder without images loads none of them.
 
 # ==============================
 # CONFIGURATION
@@ -11,103 +13,62 @@ from openpyxl.styles import PatternFill
 IMAGES_FOLDER = "images"
 OUTPUT_FOLDER = "translated_images"
 REPORT_XLSX = "japanese_text_report.xlsx"
+REPORT_CSV = "japanese_text_report.csv"  # written alongside the XLSX; None = XLSX only
 
 DEEPL_API_KEY = "YOUR_DEEPL_API_KEY"
+TRANSLATION_BACKEND = "deepl"  # "deepl", "memory" (translation memory only, offline) or "fake"
+TRANSLATION_MEMORY = "translation_memory.sqlite3"  # shared with the source scanners; None = off
 FONT_PATH = "arial.ttf"  # Path to TTF font
 MAX_FONT_SIZE = 40        # Max font size for overlay
+OCR_WORKERS = None        # OCR processes; None = one per CPU core
+OCR_GROUPING = "line"     # translate each "word", "line" or "paragraph"
+RENDER_WORKERS = None     # rendering processes; None = one per CPU core
+DEDUP_THRESHOLD = 2       # reuse OCR/translations of look-alike images and regions; None = off
 
-os.makedirs(OUTPUT_FOLDER, exist_ok=True)
-
-translator = deepl.Translator(DEEPL_API_KEY)
-
-# ==============================
-# CREATE EXCEL REPORT
-# ==============================
-wb = Workbook()
-ws = wb.active
-ws.title = "OCR Translation Report"
-
-# Header row
-headers = ["Image File", "X", "Y", "Width", "Height", "Japanese Text", "English Translation"]
-ws.append(headers)
-
-# Add fill colors
-japanese_fill = PatternFill(start_color="FFFF99", end_color="FFFF99", fill_type="solid")  # Yellow
-english_fill = PatternFill(start_color="99CCFF", end_color="99CCFF", fill_type="solid")  # Blue
-
-# ==============================
-# STEP 1: Extract and Translate
-# ==============================
-report_rows = []
-
-for filename in os.listdir(IMAGES_FOLDER):
-    if filename.lower().endswith((".png", ".jpg", ".jpeg")):
-        image_path = os.path.join(IMAGES_FOLDER, filename)
-        img = Image.open(image_path)
-
-        data = pytesseract.image_to_data(img, lang='jpn', output_type=pytesseract.Output.DICT)
-        n_boxes = len(data['level'])
-
-        for i in range(n_boxes):
-            text = data['text'][i].strip()
-            if text == "":
-                continue
-
-            x, y, w, h = data['left'][i], data['top'][i], data['width'][i], data['height'][i]
-
-            # Translate Japanese to English
-            try:
-                translation = translator.translate_text(text, source_lang="JA", target_lang="EN-US").text
-            except Exception as e:
-                translation = text  # fallback
-                print(f"Translation failed for '{text}': {e}")
-
-            # Append to report
-            row = [filename, x, y, w, h, text, translation]
-            report_rows.append(row)
-
-            ws.append(row)
-            ws.cell(row=ws.max_row, column=6).fill = japanese_fill
-            ws.cell(row=ws.max_row, column=7).fill = english_fill
-
-# Save Excel report
-wb.save(REPORT_XLSX)
-print(f"Excel report generated: {REPORT_XLSX}")
-print("Please review/validate the report before replacing text in images.\n")
 
 # ==============================
 # STEP 2: Replace text in images after validation
 # ==============================
-proceed = input("Do you want to replace Japanese text with English in images? (y/n): ").lower()
-if proceed != "y":
-    print("Process terminated. You can edit the report and rerun.")
-    exit()
-
-for row in report_rows:
-    filename, x, y, w, h, japanese_text, english_text = row
-    image_path = os.path.join(IMAGES_FOLDER, filename)
-    output_path = os.path.join(OUTPUT_FOLDER, filename)
-
-    img = Image.open(image_path)
-    draw = ImageDraw.Draw(img)
-
-    # Cover original Japanese text
-    draw.rectangle([x, y, x + w, y + h], fill="white")
-
-    # Adjust font size to fit bounding box width
-    font_size = MAX_FONT_SIZE
-    font = ImageFont.truetype(FONT_PATH, font_size)
-    while font.getsize(english_text)[0] > w and font_size > 5:
-        font_size -= 1
-        font = ImageFont.truetype(FONT_PATH, font_size)
-
-    # Draw English text
-    draw.text((x, y), english_text, fill="black", font=font)
-
-    img.save(output_path)
-    print(f"Translated image saved: {output_path}")
-
-print("\nAll images processed successfully!")
+def replace_text():
+    """Draw the reviewed translations from REPORT_XLSX onto copies of the images.
+
+    The report is streamed back from disk, so edits made during review are
+    used and no rows are held in memory.
+    """
+    rows = read_image_report(REPORT_XLSX)
+    for output_path in render_images(rows, IMAGES_FOLDER, OUTPUT_FOLDER, FONT_PATH, MAX_FONT_SIZE,
+                                     fit=True, workers=RENDER_WORKERS):
+        print(f"Translated image saved: {output_path}")
+
+
+def main():
+    filenames = list_images(IMAGES_FOLDER)
+    if not filenames:
+        print(f"No images found in {IMAGES_FOLDER}")
+        return
+
+    # Excel report (write-only, shared named styles), plus the same rows as CSV
+    with ImageReportWriter(csv_path=REPORT_CSV, xlsx_path=REPORT_XLSX) as report:
+        paths = [os.path.join(IMAGES_FOLDER, filename) for filename in filenames]
+        engine = translate_images(paths, report, backend=TRANSLATION_BACKEND, auth_key=DEEPL_API_KEY,
+                                  memory_path=TRANSLATION_MEMORY, workers=OCR_WORKERS,
+                                  level=OCR_GROUPING, dedup_threshold=DEDUP_THRESHOLD)
+    print(f"Translated {len(engine.translations)} unique texts ({engine.memory_hits} from "
+          f"translation memory, {engine.requests} requests)")
+    print(f"Excel report generated: {REPORT_XLSX}")
+    print("Please review/validate the report before replacing text in images.\n")
+
+    proceed = input("Do you want to replace Japanese text with English in images? (y/n): ").lower()
+    if proceed != "y":
+        print("Process terminated. You can edit the report and rerun.")
+        return
+
+    replace_text()
+    print("\nAll images processed successfully!")
+
+
+if __name__ == "__main__":
+    main()
 
 # pip install pillow pytesseract deepl openpyxl
 #Tesseract OCR with Japanese language (jpn) installed:
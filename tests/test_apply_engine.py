@@ -0,0 +1,91 @@
+import hashlib
+
+from translatorprog.apply_engine import apply_file
+from translatorprog.extractors import extract_buffer_spans
+
+
+def scan_rows(path, translations):
+    """Report rows for ``path`` as the scanner writes them, translated from ``translations``."""
+    data = path.read_bytes()
+    file_hash = hashlib.sha256(data).hexdigest()
+    return [{"file": str(path), "line_number": str(span.line), "column": str(span.column),
+             "start": str(span.start), "end": str(span.end), "japanese_text": span.text,
+             "english_text": translations.get(span.text, ""), "file_hash": file_hash}
+            for span in extract_buffer_spans(data, str(path))]
+
+
+def test_replaces_only_the_reported_occurrence(tmp_path):
+    path = tmp_path / "Main.java"
+    path.write_bytes('a("名前"); // 名前\n'.encode("utf-8"))
+    rows = scan_rows(path, {"名前": "Name"})
+    assert apply_file(str(path), rows[:1]) == (1, 0)
+    assert path.read_bytes().decode("utf-8") == 'a("Name"); // 名前\n'
+
+
+def test_keeps_crlf_in_multiline_spans(tmp_path):
+    path = tmp_path / "main.dart"
+    path.write_bytes("var s = '''一行目\r\n二行目''';\r\n// 説明\r\n".encode("utf-8"))
+    rows = scan_rows(path, {"一行目\n二行目": "first\nsecond", "説明": "Note"})
+    assert [row["japanese_text"] for row in rows] == ["一行目\n二行目", "説明"]
+    assert apply_file(str(path), rows) == (2, 0)
+    assert path.read_bytes() == b"var s = '''first\r\nsecond''';\r\n// Note\r\n"
+
+
+def test_overlapping_rows_keep_the_outer_span(tmp_path):
+    path = tmp_path / "Main.java"
+    path.write_bytes('s = "日本語テキスト";\n'.encode("utf-8"))
+    (row,) = scan_rows(path, {"日本語テキスト": "Japanese text"})
+    inner_start = int(row["start"]) + len("日本語".encode("utf-8"))
+    inner = dict(row, start=str(inner_start), japanese_text="テキスト", english_text="text")
+    assert apply_file(str(path), [inner, row]) == (1, 1)
+    assert path.read_bytes() == b's = "Japanese text";\n'
+
+
+def test_hash_mismatch_rejects_every_row(tmp_path):
+    path = tmp_path / "Main.java"
+    path.write_bytes('s = "値"; t = "名前";\n'.encode("utf-8"))
+    rows = scan_rows(path, {"値": "Value", "名前": "Name"})
+    path.write_bytes('s = "値"; t = "名前"; // edited\n'.encode("utf-8"))
+    assert apply_file(str(path), rows) == (0, 2)
+    assert path.read_bytes().decode("utf-8") == 's = "値"; t = "名前"; // edited\n'
+
+
+def test_missing_file_rejects_every_row(tmp_path):
+    path = tmp_path / "Main.java"
+    path.write_bytes('s = "値";\n'.encode("utf-8"))
+    rows = scan_rows(path, {"値": "Value"})
+    path.unlink()
+    assert apply_file(str(path), rows) == (0, 1)
+    assert not path.exists()
+
+
+def test_legacy_rows_without_offsets(tmp_path):
+    path = tmp_path / "app.yml"
+    path.write_bytes("a: 名前\nb: x 名前\n".encode("utf-8"))
+    rows = [
+        # column recorded: only that occurrence
+        {"file": str(path), "line_number": "2", "column": "6", "japanese_text": "名前",
+         "english_text": "Name", "file_hash": ""},
+        # no column: first occurrence on the line
+        {"file": str(path), "line_number": "1", "japanese_text": "名前",
+         "english_text": "Title"},
+        # stale column: rejected
+        {"file": str(path), "line_number": "2", "column": "4", "japanese_text": "名前",
+         "english_text": "Other"},
+    ]
+    assert apply_file(str(path), rows) == (2, 1)
+    assert path.read_bytes() == b"a: Title\nb: x Name\n"
+
+
+def test_invalid_utf8_bytes_are_kept(tmp_path):
+    path = tmp_path / "messages.properties"
+    path.write_bytes(b"# caf\xe9\nkey=\xe9 \xe5\x80\xa4\nother=\xe5\x90\x8d\xe5\x89\x8d\n")
+    rows = scan_rows(path, {"名前": "Name"})
+    assert apply_file(str(path), rows) == (1, 0)
+    assert path.read_bytes() == b"# caf\xe9\nkey=\xe9 \xe5\x80\xa4\nother=Name\n"
+
+    # Legacy rows count the stray byte as one column
+    legacy = {"file": str(path), "line_number": "2", "column": "7", "japanese_text": "値",
+              "english_text": "value"}
+    assert apply_file(str(path), [legacy]) == (1, 0)
+    assert path.read_bytes() == b"# caf\xe9\nkey=\xe9 value\nother=Name\n"
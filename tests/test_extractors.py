@@ -0,0 +1,96 @@
+from translatorprog.extractors import (
+    BLOCK_COMMENT, CONFIG_VALUE, DOC_COMMENT, LINE_COMMENT, STRING_LITERAL,
+    extract_buffer_spans, tokenize_c_style, tokenize_properties, tokenize_yaml,
+)
+
+
+def spans(tokenize, content):
+    return [(span.kind, span.text) for span in tokenize(content)]
+
+
+# =============================
+# C-STYLE
+# =============================
+def test_comment_marker_inside_string_is_part_of_the_string():
+    assert spans(tokenize_c_style, 'url = "http://例え"; // コメント\n') == [
+        (STRING_LITERAL, "http://例え"),
+        (LINE_COMMENT, "コメント"),
+    ]
+
+
+def test_triple_quoted_and_backtick_strings():
+    content = "a = '''三重\n単一''' + \"\"\"二重\"\"\" + `テンプレ ${b}`;\n"
+    assert spans(tokenize_c_style, content) == [
+        (STRING_LITERAL, "三重\n単一"),
+        (STRING_LITERAL, "二重"),
+        (STRING_LITERAL, "テンプレ ${b}"),
+    ]
+
+
+def test_dart_triple_slash_is_a_doc_comment():
+    assert spans(tokenize_c_style, "/// ドキュメント\n// 行\n") == [
+        (DOC_COMMENT, "ドキュメント"),
+        (LINE_COMMENT, "行"),
+    ]
+
+
+def test_empty_block_comments_are_not_doc_comments():
+    content = "/**/ a /***/ b /* ブロック */ c /** 説明\n * 二行目\n */"
+    assert spans(tokenize_c_style, content) == [
+        (BLOCK_COMMENT, "ブロック"),
+        (DOC_COMMENT, "説明"),
+        (DOC_COMMENT, "二行目"),
+    ]
+
+
+def test_offsets_index_the_content():
+    content = 'x = "値"; /* 説明 */'
+    for span in tokenize_c_style(content):
+        assert content[span.start:span.end] == span.text
+
+
+# =============================
+# YAML / PROPERTIES
+# =============================
+def test_yaml_values_and_comments():
+    content = ("title: タイトル  # コメント\n"
+               "list:\n"
+               "  - 項目\n"
+               "q: \"引用\"\n"
+               "url: http://x#y\n"
+               "# 全行\n")
+    assert spans(tokenize_yaml, content) == [
+        (CONFIG_VALUE, "タイトル"),
+        (LINE_COMMENT, "コメント"),
+        (CONFIG_VALUE, "項目"),
+        (CONFIG_VALUE, "引用"),
+        (CONFIG_VALUE, "http://x#y"),
+        (LINE_COMMENT, "全行"),
+    ]
+
+
+def test_properties_values_and_comments():
+    content = "# コメント\n! 感嘆\nkey = 値  \nkey2:値2\r\nempty=\n"
+    assert spans(tokenize_properties, content) == [
+        (LINE_COMMENT, "コメント"),
+        (LINE_COMMENT, "感嘆"),
+        (CONFIG_VALUE, "値"),
+        (CONFIG_VALUE, "値2"),
+    ]
+
+
+# =============================
+# BUFFERS
+# =============================
+def test_buffer_spans_keep_byte_offsets_and_positions():
+    buffer = "a = 1;\r\n// english\r\nb = \"値\\\"です\";\n".encode("utf-8")
+    (span,) = extract_buffer_spans(buffer, "Example.java")
+    assert (span.line, span.column) == (3, 6)
+    assert buffer[span.start:span.end].decode("utf-8") == span.text == '値\\"です'
+
+
+def test_buffer_spans_survive_invalid_utf8():
+    buffer = b"# caf\xe9\nkey=\xe9 \xe5\x80\xa4\n"
+    (span,) = extract_buffer_spans(buffer, "messages.properties")
+    assert span.text == "� 値"
+    assert (span.line, span.column) == (2, 5)
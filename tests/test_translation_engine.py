@@ -0,0 +1,63 @@
+import pytest
+
+from translatorprog import translation_engine
+from translatorprog.translation_backends import FakeBackend
+from translatorprog.translation_engine import BatchTranslator
+from translatorprog.translation_memory import TranslationMemory
+
+
+@pytest.fixture(autouse=True)
+def fast_backoff(monkeypatch):
+    monkeypatch.setattr(translation_engine, "BACKOFF_BASE", 0.001)
+
+
+def translate(engine, texts):
+    try:
+        for text in texts:
+            engine.add(text)
+        return engine.translate_all()
+    finally:
+        engine.close()
+
+
+def test_translates_unique_texts_in_batches():
+    backend = FakeBackend(latency=0)
+    engine = BatchTranslator(backend, max_texts=3, rate_limit=1000)
+    texts = [f"テキスト{i}。" for i in range(10)]
+    translations = translate(engine, texts + texts[:4])
+    assert translations == {text: f"[EN-US] {text[:-1]}." for text in texts}
+    assert backend.calls == engine.requests == 4
+
+
+def test_retries_rate_limited_requests():
+    backend = FakeBackend(latency=0, rate_429=0.5, seed=1)
+    engine = BatchTranslator(backend, max_texts=2, rate_limit=1000, concurrency=1,
+                             postprocess=lambda text: text)
+    texts = [f"テキスト{i}" for i in range(20)]
+    translations = translate(engine, texts)
+    assert translations == {text: f"[EN-US] {text}" for text in texts}
+    assert backend.throttled == engine.retries > 0
+    assert engine.requests == 10 + engine.retries
+
+
+def test_gives_up_after_max_retries():
+    backend = FakeBackend(latency=0, rate_429=1.0)
+    engine = BatchTranslator(backend, rate_limit=1000, max_retries=2)
+    translations = translate(engine, ["値"])
+    # Failed batches fall back to the source text
+    assert translations == {"値": "値"}
+    assert engine.requests == 3 and engine.retries == 2
+
+
+def test_memory_hits_skip_the_backend(tmp_path):
+    memory = TranslationMemory(str(tmp_path / "memory.sqlite3"))
+    try:
+        memory.store_many([("名前", "Name")], "JA", "EN-US")
+        backend = FakeBackend(latency=0)
+        engine = BatchTranslator(backend, rate_limit=1000, memory=memory)
+        assert translate(engine, ["名前", "値"]) == {"名前": "Name", "値": "[EN-US] 値"}
+        assert engine.memory_hits == 1 and backend.calls == 1
+        # New translations are written back
+        assert memory.lookup_many(["値"], "JA", "EN-US") == {"値": "[EN-US] 値"}
+    finally:
+        memory.close()
@@ -1,8 +1,12 @@
-import os
-import re
-import csv
-import shutil
-import deepl
+"""Scan a Spring Boot project, translating while scanning, then apply after review.
+
+Thin wrapper around the translatorprog CLI. The same run without the
+review prompt is:
+
+    python -m translatorprog scan PROJECT --translate
+    python -m translatorprog apply --project PROJECT
+"""
+from translatorprog import cli
 
 # =============================
 # CONFIGURATION
@@ -17,123 +21,22 @@ IGNORE_DIRS = {".git", "build", "dist", "target", "node_modules", ".dart_tool",
 
 TARGET_LANG = "EN-US"
 
-# =============================
-# INITIALIZE DEEPL
-# =============================
-translator = deepl.Translator(API_KEY)
-
-# =============================
-# REGEX
-# =============================
-# Any Japanese character
-JAPANESE_REGEX = re.compile(r'[\u3040-\u30ff\u4e00-\u9faf]')
-
-# YAML / properties value
-YML_VALUE_REGEX = re.compile(r'(:\s*)(["\']?)(.+?)(["\']?)$')
-
-# =============================
-# CREATE BACKUP
-# =============================
-if not os.path.exists(BACKUP_FOLDER):
-    shutil.copytree(PROJECT_PATH, BACKUP_FOLDER)
-    print(f"Backup created at: {BACKUP_FOLDER}")
-
-# =============================
-# TRANSLATION FUNCTION
-# =============================
-def translate_text(text: str) -> str:
-    try:
-        translated = translator.translate_text(text, source_lang="JA", target_lang=TARGET_LANG).text
-        return translated.replace("。", ".")
-    except Exception as e:
-        print(f"Translation failed for '{text}': {e}")
-        return text
-
-# =============================
-# STEP 1: SCAN FILES AND GENERATE REPORT
-# =============================
-report_rows = []
-translation_cache = {}
-
-for root, dirs, files in os.walk(PROJECT_PATH):
-    dirs[:] = [d for d in dirs if d not in IGNORE_DIRS]
-
-    for file in files:
-        if not file.endswith(FILE_EXTENSIONS):
-            continue
-
-        path = os.path.join(root, file)
-        with open(path, "r", encoding="utf-8") as f:
-            lines = f.readlines()
-
-        for line_no, line in enumerate(lines, start=1):
-            # --- Detect all Japanese substrings in the line ---
-            jp_texts = re.findall(r'[\u3040-\u30ff\u4e00-\u9faf][\u3040-\u30ff\u4e00-\u9faf。、]*', line)
-            for jp_text in jp_texts:
-                jp_text = jp_text.strip()
-                if not jp_text:
-                    continue
-                if jp_text not in translation_cache:
-                    translation_cache[jp_text] = translate_text(jp_text)
-                report_rows.append({
-                    "file": path,
-                    "line_number": line_no,
-                    "japanese_text": jp_text,
-                    "english_text": translation_cache[jp_text]
-                })
 
-            # --- YAML / properties special handling ---
-            if file.endswith((".yml", ".yaml")):
-                m = YML_VALUE_REGEX.search(line)
-                if m:
-                    val = m.group(3).strip()
-                    if JAPANESE_REGEX.search(val):
-                        if val not in translation_cache:
-                            translation_cache[val] = translate_text(val)
-                        report_rows.append({
-                            "file": path,
-                            "line_number": line_no,
-                            "japanese_text": val,
-                            "english_text": translation_cache[val]
-                        })
-
-            if file.endswith(".properties") and "=" in line and not line.strip().startswith("#"):
-                val = line.split("=",1)[1].strip()
-                if JAPANESE_REGEX.search(val):
-                    if val not in translation_cache:
-                        translation_cache[val] = translate_text(val)
-                    report_rows.append({
-                        "file": path,
-                        "line_number": line_no,
-                        "japanese_text": val,
-                        "english_text": translation_cache[val]
-                    })
-
-# Deduplicate
-unique = {(r["file"], r["line_number"], r["japanese_text"]): r for r in report_rows}
-report_rows = list(unique.values())
-
-# Save CSV report
-with open(REPORT_CSV, "w", newline="", encoding="utf-8") as f:
-    writer = csv.DictWriter(f, fieldnames=["file","line_number","japanese_text","english_text"])
-    writer.writeheader()
-    writer.writerows(report_rows)
-
-print(f"✅ Report generated: {REPORT_CSV}")
-print(f"Total Japanese entries found: {len(report_rows)}")
-input("Review the CSV if needed, then press Enter to apply translations...")
-
-# =============================
-# STEP 2: APPLY TRANSLATIONS
-# =============================
-for row in report_rows:
-    with open(row["file"], "r", encoding="utf-8") as f:
-        content = f.read()
+def main():
+    # =============================
+    # STEP 1: SCAN FILES AND GENERATE REPORT
+    # =============================
+    cli.main(["scan", PROJECT_PATH, "--report", REPORT_CSV, "--translate",
+              "--extensions", *FILE_EXTENSIONS, "--ignore-dirs", *sorted(IGNORE_DIRS),
+              "--auth-key", API_KEY, "--target-lang", TARGET_LANG])
+    input("Review the CSV if needed, then press Enter to apply translations...")
 
-    # Replace Japanese text with English
-    content = content.replace(row["japanese_text"], row["english_text"])
+    # =============================
+    # STEP 2: APPLY TRANSLATIONS
+    # =============================
+    cli.main(["apply", "--report", REPORT_CSV, "--backup", BACKUP_FOLDER, "--project", PROJECT_PATH])
+    print("✅ Japanese → English translation applied successfully.")
 
-    with open(row["file"], "w", encoding="utf-8") as f:
-        f.write(content)
 
-print("✅ Japanese → English translation applied successfully.")
+if __name__ == "__main__":
+    main()
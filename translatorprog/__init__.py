@@ -0,0 +1,4 @@
+"""Find Japanese text in source trees, translate it and write it back.
+
+Run ``python -m translatorprog --help`` for the command-line interface.
+"""
@@ -0,0 +1,196 @@
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+
+from .metrics import Metrics
+
+# Lines split exactly the way the scanners number them: \r\n, \r and \n
+# each end one line.
+LINE_SPLIT_REGEX = re.compile(rb'[^\r\n]*(?:\r\n|\r|\n)|[^\r\n]+\Z')
+
+# Files are edited as bytes. Text is decoded with surrogateescape where
+# character columns must be counted, so bytes that are not valid UTF-8
+# (e.g. a stray Latin-1 byte in a .properties file) survive unchanged.
+ESCAPE = "surrogateescape"
+
+
+# =============================
+# FILE WRITES
+# =============================
+def atomic_write(path, content, encoding="utf-8"):
+    """Replace ``path`` with ``content`` via a temp file in the same directory.
+
+    The original file is either left untouched or fully replaced, never
+    half-written, even if the process dies mid-write. ``content`` may be
+    str or bytes. A symlink is written through: its target is replaced and
+    the link is left in place.
+    """
+    path = os.path.realpath(path)
+    directory = os.path.dirname(path)
+    fd, tmp_path = tempfile.mkstemp(prefix=".translate-", suffix=".tmp", dir=directory)
+    try:
+        if isinstance(content, bytes):
+            f = os.fdopen(fd, "wb")
+        else:
+            f = os.fdopen(fd, "w", encoding=encoding, newline="")
+        with f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(path):
+            shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+# =============================
+# APPLY ENGINE
+# =============================
+def group_rows(rows):
+    """Group report rows by file, keeping the report's file order."""
+    groups = {}
+    for row in rows:
+        groups.setdefault(row["file"], []).append(row)
+    return groups
+
+
+def span_text(data, start, end):
+    """Text of data[start:end] as the scanner reports it."""
+    text = data[start:end].decode("utf-8", "replace")
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def encode_replacement(data, start, end, text):
+    """``text`` as UTF-8, with newlines matching those of the span it replaces."""
+    original = data[start:end]
+    if b"\r\n" in original:
+        text = text.replace("\n", "\r\n")
+    elif b"\r" in original:
+        text = text.replace("\n", "\r")
+    return text.encode("utf-8")
+
+
+def line_starts(data):
+    """(byte offset, line bytes) of every line in ``data``."""
+    return [(m.start(), m.group()) for m in LINE_SPLIT_REGEX.finditer(data)]
+
+
+def has_offsets(row):
+    return row.get("start") not in (None, "") and row.get("end") not in (None, "")
+
+
+def locate(data, row, lines):
+    """Byte (start, end) of the row's span in ``data``, or None if it is not there.
+
+    Rows carry the byte ``start``/``end`` the extractor found, which also
+    covers spans running over several lines. Reports without them fall back
+    to the 1-based ``column`` on the reported line, then to the first
+    occurrence on that line, using ``lines`` from line_starts().
+    """
+    text = row["japanese_text"]
+    if has_offsets(row):
+        start, end = int(row["start"]), int(row["end"])
+        return (start, end) if span_text(data, start, end) == text else None
+
+    index = int(row["line_number"]) - 1
+    if index >= len(lines):
+        return None
+    offset, line = lines[index]
+    if row.get("column") not in (None, ""):
+        decoded = line.decode("utf-8", ESCAPE)
+        column = int(row["column"]) - 1
+        if decoded[column:column + len(text)] != text:
+            return None
+        start = offset + len(decoded[:column].encode("utf-8", ESCAPE))
+        return start, start + len(text.encode("utf-8"))
+    found = line.find(text.encode("utf-8"))
+    return (offset + found, offset + found + len(text.encode("utf-8"))) if found >= 0 else None
+
+
+def splice(content, edits):
+    """Apply (start, end, replacement) edits to ``content``, in offset order."""
+    pieces, pos = [], 0
+    for start, end, replacement in edits:
+        pieces.append(content[pos:start])
+        pieces.append(replacement)
+        pos = end
+    pieces.append(content[pos:])
+    return content[:0].join(pieces)
+
+
+def apply_file(path, rows, backup=None, metrics=None):
+    """Splice every row's span in ``path`` and write it once.
+
+    Only the exact byte span of each row is replaced, so other occurrences
+    of the same text are left alone, and bytes outside the spans are kept as
+    they are even if they are not valid UTF-8. If the file cannot be read,
+    or its SHA-256 no longer matches the ``file_hash`` recorded at scan
+    time, nothing is written and every row is rejected. A LazyBackup (see backup.py) copies the original just before
+    the write; its time is charged to the "backup" phase of ``metrics``.
+    Returns (edits, rejected).
+    """
+    rows = [row for row in rows
+            if row["english_text"] and row["english_text"] != row["japanese_text"]]
+    if not rows:
+        return 0, 0
+
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError as e:
+        print(f"Skipped {path}: {e.strerror}")
+        return 0, len(rows)
+    expected = {row["file_hash"] for row in rows if row.get("file_hash")}
+    if expected and hashlib.sha256(data).hexdigest() not in expected:
+        print(f"Skipped {path}: file changed since the scan")
+        return 0, len(rows)
+
+    # Only reports without byte offsets need the file split into lines
+    lines = None if all(has_offsets(row) for row in rows) else line_starts(data)
+    candidates = []
+    rejected = 0
+    for row in rows:
+        span = locate(data, row, lines)
+        if span is None:
+            print(f"Skipped {path}:{row['line_number']}: '{row['japanese_text']}' not found")
+            rejected += 1
+            continue
+        candidates.append((*span, encode_replacement(data, *span, row["english_text"])))
+
+    # Outer spans sort before spans nested in them; overlapping edits are dropped
+    candidates.sort(key=lambda edit: (edit[0], -edit[1]))
+    accepted, end = [], 0
+    for edit in candidates:
+        if edit[0] < end:
+            rejected += 1
+            continue
+        accepted.append(edit)
+        end = edit[1]
+
+    if accepted:
+        if backup is not None:
+            with (metrics or Metrics()).phase("backup"):
+                backup.save_original(path)
+        atomic_write(path, splice(data, accepted))
+    return len(accepted), rejected
+
+
+def apply_rows(rows, backup=None, metrics=None):
+    """Apply report rows file by file. Returns (files_written, edits, rejected)."""
+    metrics = metrics or Metrics()
+    files_written = edits = rejected = 0
+    with metrics.phase("apply"):
+        for path, file_rows in group_rows(rows).items():
+            file_edits, file_rejected = apply_file(path, file_rows, backup, metrics)
+            if file_edits:
+                files_written += 1
+                edits += file_edits
+            rejected += file_rejected
+    metrics.count("files_written_total", files_written)
+    metrics.count("edits_total", edits, result="applied")
+    metrics.count("edits_total", rejected, result="rejected")
+    return files_written, edits, rejected
@@ -0,0 +1,88 @@
+import hashlib
+import json
+import os
+import shutil
+
+from .apply_engine import atomic_write
+
+# =============================
+# CONFIGURATION
+# =============================
+MANIFEST_NAME = "backup_manifest.json"
+
+
+# =============================
+# LAZY BACKUP
+# =============================
+class LazyBackup:
+    """Backs up each file just before the apply phase first rewrites it.
+
+    Instead of copying the whole project (node_modules, build, .dart_tool
+    and all) up front, only files that are actually modified are copied into
+    ``backup_folder``, mirroring their path relative to ``project_path``. The
+    manifest is rewritten after every copy, so it is complete even if the run
+    dies part-way. A file already in the manifest from an earlier run is not
+    copied again, so rollback always restores the pre-translation original.
+    """
+
+    def __init__(self, backup_folder, project_path):
+        self.backup_folder = backup_folder
+        self.project_path = os.path.abspath(project_path)
+        self.manifest_path = os.path.join(backup_folder, MANIFEST_NAME)
+        self.entries = load_manifest(backup_folder)
+
+    def backup_path(self, path):
+        relative = os.path.relpath(os.path.abspath(path), self.project_path)
+        if relative.startswith(os.pardir):
+            # Outside the project: mirror the absolute path without its drive
+            relative = os.path.splitdrive(os.path.abspath(path))[1].lstrip("\\/")
+        return relative
+
+    def save_original(self, path):
+        """Copy ``path`` into the backup folder unless it is already there."""
+        key = os.path.abspath(path)
+        if key in self.entries:
+            return
+        relative = self.backup_path(path)
+        target = os.path.join(self.backup_folder, relative)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copy2(path, target)
+        with open(target, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        self.entries[key] = {"backup": relative, "sha256": digest}
+        self.save()
+
+    def save(self):
+        os.makedirs(self.backup_folder, exist_ok=True)
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+
+def load_manifest(backup_folder):
+    manifest_path = os.path.join(backup_folder, MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        return {}
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+# =============================
+# ROLLBACK
+# =============================
+def rollback(backup_folder):
+    """Restore every file recorded in the backup manifest. Returns the count."""
+    restored = 0
+    for path, entry in load_manifest(backup_folder).items():
+        with open(os.path.join(backup_folder, entry["backup"]), "rb") as f:
+            data = f.read()
+        if hashlib.sha256(data).hexdigest() != entry["sha256"]:
+            print(f"Skipped {path}: backup copy is corrupted")
+            continue
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        atomic_write(path, data)
+        restored += 1
+        print(f"Restored {path}")
+    return restored
+
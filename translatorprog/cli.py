@@ -0,0 +1,278 @@
+"""Command-line interface: scan, translate, apply and rollback.
+
+    python -m translatorprog scan PROJECT --report report.csv [--translate]
+    python -m translatorprog translate --report report.csv
+    python -m translatorprog apply --report report.csv --backup backup_project
+    python -m translatorprog rollback --backup backup_project
+    python -m translatorprog diff --cached    # pre-commit: fail on new Japanese
+
+Nothing prompts for input, so every step can run in CI. The DeepL key is
+read from --auth-key or the DEEPL_AUTH_KEY environment variable.
+"""
+import argparse
+import os
+import sys
+
+from .extractors import TOKENIZERS
+from .metrics import Metrics
+from .pipeline import DEFAULT_EXTENSIONS, DEFAULT_IGNORE_DIRS, scan_project
+from .scan_manifest import ScanManifest
+from .translation_backends import BACKENDS
+
+# =============================
+# CONFIGURATION
+# =============================
+DEFAULT_REPORT = "japanese_report.csv"
+DEFAULT_BACKUP = "backup_project"
+
+
+# =============================
+# TRANSLATION SETUP
+# =============================
+def make_engine(args, metrics=None):
+    """BatchTranslator (and its memory, or None) from the translation flags."""
+    # Imported on demand: a scan without --translate never loads the
+    # translation engine, sqlite3 or a backend's client library.
+    from .translation_backends import create_backend
+    from .translation_engine import (DEFAULT_CONCURRENCY, DEFAULT_REQUESTS_PER_SECOND,
+                                     POSTPROCESS_VERSION, BatchTranslator, postprocess)
+    from .translation_memory import DEFAULT_PATH, RAW_VERSION, TranslationMemory
+
+    memory = None
+    if not args.no_memory:
+        # Raw and post-processed translations share the file but not entries
+        version = POSTPROCESS_VERSION if args.postprocess else RAW_VERSION
+        memory = TranslationMemory(args.memory or DEFAULT_PATH, version=version)
+    backend = create_backend(args.backend, auth_key=args.auth_key, memory=memory)
+    source_lang = None if args.source_lang.lower() == "auto" else args.source_lang
+    concurrency = DEFAULT_CONCURRENCY if args.concurrency is None else args.concurrency
+    rate_limit = DEFAULT_REQUESTS_PER_SECOND if args.rate_limit is None else args.rate_limit
+    engine = BatchTranslator(backend, source_lang=source_lang, target_lang=args.target_lang,
+                             postprocess=postprocess if args.postprocess else (lambda text: text),
+                             memory=memory, concurrency=concurrency,
+                             rate_limit=rate_limit, metrics=metrics)
+    return engine, memory
+
+
+def close_engine(engine, memory):
+    engine.close()
+    if memory is not None:
+        memory.close()
+    print(f"Translated {len(engine.translations)} unique snippets "
+          f"({engine.memory_hits} from translation memory, {engine.requests} requests, "
+          f"{engine.retries} rate-limit retries)")
+
+
+def write_metrics(args, metrics):
+    if args.metrics:
+        metrics.write(args.metrics, args.metrics_format)
+        print(f"Metrics written to {args.metrics}")
+
+
+# =============================
+# COMMANDS
+# =============================
+def cmd_scan(args):
+    metrics = Metrics()
+    manifest = None
+    if not args.no_manifest:
+        manifest = ScanManifest(args.manifest or ScanManifest.path_for(args.report))
+    engine = memory = None
+    if args.translate:
+        engine, memory = make_engine(args, metrics)
+    profiler = workers = None
+    if args.profile_extract:
+        import cProfile
+
+        # Extraction has to run in this process for the profiler to see it
+        profiler, workers = cProfile.Profile(), 1
+    try:
+        report = scan_project(args.project, args.report, engine=engine,
+                              extensions=args.extensions, ignore_dirs=args.ignore_dirs,
+                              workers=workers or args.workers, manifest=manifest,
+                              resume=args.resume, skip_emails=args.skip_emails,
+                              skip_patterns=args.skip_patterns,
+                              metrics=metrics, profiler=profiler)
+    finally:
+        if engine is not None:
+            close_engine(engine, memory)
+    if profiler is not None:
+        profiler.dump_stats(args.profile_extract)
+        print(f"Extraction profile written to {args.profile_extract} (python -m pstats to read)")
+    write_metrics(args, metrics)
+    if manifest is not None:
+        print(f"Scanned {manifest.extracted} changed files, reused {manifest.reused} from {manifest.path}")
+    print(f"Report generated: {args.report} ({report.rows_written} Japanese entries)")
+    return 0
+
+
+def cmd_translate(args):
+    from .pipeline import translate_report
+
+    metrics = Metrics()
+    engine, memory = make_engine(args, metrics)
+    try:
+        rows = translate_report(args.report, engine, metrics)
+    finally:
+        close_engine(engine, memory)
+    print(f"Report updated with translations: {args.report} ({rows} rows)")
+    write_metrics(args, metrics)
+    return 0
+
+
+def cmd_apply(args):
+    from .apply_engine import apply_rows
+    from .backup import LazyBackup
+    from .report_writer import read_report
+
+    metrics = Metrics()
+    backup = LazyBackup(args.backup, args.project)
+    files_written, edits, rejected = apply_rows(read_report(args.report), backup, metrics)
+    print(f"Applied {edits} edits to {files_written} files ({rejected} rejected)")
+    print(f"Originals saved in {args.backup}; undo with: python -m translatorprog rollback --backup {args.backup}")
+    write_metrics(args, metrics)
+    return 1 if rejected and args.strict else 0
+
+
+def cmd_rollback(args):
+    from .backup import rollback
+
+    print(f"Restored {rollback(args.backup)} files from {args.backup}")
+    return 0
+
+
+def cmd_diff(args):
+    import subprocess
+
+    from .git_diff import diff_findings
+
+    try:
+        findings = list(diff_findings(args.repo, args.revisions, cached=args.cached,
+                                      extensions=args.extensions))
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    except subprocess.CalledProcessError as e:
+        print(f"git failed: {e}", file=sys.stderr)
+        return 2
+    except OSError as e:
+        print(f"Cannot check {e.filename}: {e.strerror}", file=sys.stderr)
+        return 2
+    for finding in findings:
+        text = finding.text.replace("\n", " ")
+        print(f"{finding.path}:{finding.line}:{finding.column}: {finding.kind}: {text}")
+    if findings:
+        files = len({finding.path for finding in findings})
+        print(f"{len(findings)} Japanese spans added in {files} files")
+        return 1
+    return 0
+
+
+# =============================
+# ARGUMENTS
+# =============================
+def extension(value):
+    """argparse type for --extensions: only file types an extractor handles."""
+    if value.lower() not in TOKENIZERS:
+        raise argparse.ArgumentTypeError(
+            f"no extractor for {value!r} (supported: {' '.join(TOKENIZERS)})")
+    return value
+
+
+def add_translation_flags(parser):
+    group = parser.add_argument_group("translation")
+    group.add_argument("--backend", choices=BACKENDS, default="deepl",
+                       help="translation engine (default: deepl)")
+    group.add_argument("--auth-key", default=os.environ.get("DEEPL_AUTH_KEY"),
+                       help="DeepL API key (default: $DEEPL_AUTH_KEY)")
+    group.add_argument("--source-lang", default="JA", help='source language, or "auto" (default: JA)')
+    group.add_argument("--target-lang", default="EN-US", help="target language (default: EN-US)")
+    # Engine defaults are filled in by make_engine, so --help stays cheap
+    group.add_argument("--concurrency", type=int, default=None,
+                       help="requests in flight at once")
+    group.add_argument("--rate-limit", type=float, default=None,
+                       help="requests per second shared by all workers")
+    group.add_argument("--memory", default=None, help="translation memory (SQLite) path")
+    group.add_argument("--no-memory", action="store_true", help="do not use a translation memory")
+    group.add_argument("--no-postprocess", dest="postprocess", action="store_false",
+                       help="keep full-width punctuation in translations")
+
+
+def add_metrics_flags(parser):
+    group = parser.add_argument_group("instrumentation")
+    group.add_argument("--metrics", default=None, metavar="PATH",
+                       help="write counters, API latency histograms and phase times here")
+    group.add_argument("--metrics-format", choices=("json", "prometheus"), default=None,
+                       help="default: prometheus for .prom/.txt paths, json otherwise")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="translatorprog",
+                                     description="Find, translate and replace Japanese text in source trees.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    scan = commands.add_parser("scan", help="scan a project into a report CSV")
+    scan.add_argument("project", help="project root to scan")
+    scan.add_argument("--report", default=DEFAULT_REPORT, help=f"report CSV (default: {DEFAULT_REPORT})")
+    scan.add_argument("--extensions", nargs="+", type=extension, default=list(DEFAULT_EXTENSIONS),
+                      metavar="EXT",
+                      help="file extensions to scan")
+    scan.add_argument("--ignore-dirs", nargs="+", default=list(DEFAULT_IGNORE_DIRS), metavar="DIR",
+                      help="directory names to skip")
+    scan.add_argument("--workers", type=int, default=None,
+                      help="extraction processes (default: one per CPU core)")
+    scan.add_argument("--manifest", default=None,
+                      help="scan cache path (default: <report>.manifest.json)")
+    scan.add_argument("--no-manifest", action="store_true", help="re-extract every file")
+    scan.add_argument("--resume", action="store_true",
+                      help="continue an interrupted scan, skipping files already in the report")
+    scan.add_argument("--skip-emails", action="store_true",
+                      help="ignore config values that are e-mail addresses")
+    scan.add_argument("--skip-patterns", nargs="+", default=(), metavar="TEXT",
+                      help="ignore spans containing any of these substrings, e.g. $ { } for "
+                           "interpolated strings")
+    scan.add_argument("--translate", action="store_true",
+                      help="fill in the English column while scanning")
+    add_translation_flags(scan)
+    add_metrics_flags(scan)
+    scan.add_argument("--profile-extract", default=None, metavar="PATH",
+                      help="cProfile the extraction stage (in-process) and save the stats here")
+    scan.set_defaults(func=cmd_scan)
+
+    translate = commands.add_parser("translate", help="fill in missing translations in a report")
+    translate.add_argument("--report", default=DEFAULT_REPORT, help=f"report CSV (default: {DEFAULT_REPORT})")
+    add_translation_flags(translate)
+    add_metrics_flags(translate)
+    translate.set_defaults(func=cmd_translate)
+
+    apply = commands.add_parser("apply", help="write a reviewed report's translations into the files")
+    apply.add_argument("--report", default=DEFAULT_REPORT, help=f"report CSV (default: {DEFAULT_REPORT})")
+    apply.add_argument("--backup", default=DEFAULT_BACKUP, help=f"backup folder (default: {DEFAULT_BACKUP})")
+    apply.add_argument("--project", default=".", help="project root, used to lay out the backup")
+    apply.add_argument("--strict", action="store_true", help="exit with status 1 if any row was rejected")
+    add_metrics_flags(apply)
+    apply.set_defaults(func=cmd_apply)
+
+    restore = commands.add_parser("rollback", help="restore every file saved in a backup folder")
+    restore.add_argument("--backup", default=DEFAULT_BACKUP, help=f"backup folder (default: {DEFAULT_BACKUP})")
+    restore.set_defaults(func=cmd_rollback)
+
+    diff = commands.add_parser("diff", help="report Japanese on lines added by a git diff",
+                               description="Exit with status 1 if the diff adds Japanese text. "
+                                           "Revisions select the diff as in git diff.")
+    diff.add_argument("revisions", nargs="*", metavar="REV", help="zero, one or two revisions")
+    diff.add_argument("--cached", action="store_true", help="diff the index (staged changes)")
+    diff.add_argument("--repo", default=".", help="git repository (default: current directory)")
+    diff.add_argument("--extensions", nargs="+", type=extension, default=None, metavar="EXT",
+                      help="file extensions to check (default: every supported type)")
+    diff.set_defaults(func=cmd_diff)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,253 @@
+import os
+import re
+from collections import namedtuple
+
+from .prefilter import JAPANESE_BYTES_REGEX
+
+# =============================
+# SPAN TYPES
+# =============================
+# Bump EXTRACTOR_VERSION whenever the lexers change what they report, so
+# spans cached in scan manifests are re-extracted.
+EXTRACTOR_VERSION = 5
+
+DOC_COMMENT = "doc_comment"
+BLOCK_COMMENT = "block_comment"
+LINE_COMMENT = "line_comment"
+STRING_LITERAL = "string_literal"
+CONFIG_VALUE = "config_value"
+MARKUP_TEXT = "markup_text"
+
+# ``start``/``end`` are offsets of ``text`` in the scanned content, so
+# content[start:end] == text (byte offsets when a UTF-8 buffer was scanned).
+# ``line`` and ``column`` are 1-based and filled in by extract_buffer_spans().
+Span = namedtuple("Span", ["kind", "start", "end", "text", "line", "column"], defaults=(0, 0))
+
+LINE_REGEX = re.compile(r'[^\r\n]+')
+NEWLINE_BYTES_REGEX = re.compile(rb'\r\n?|\n')
+
+# =============================
+# LINE POSITIONS
+# =============================
+class LineCursor:
+    """1-based (line, column) of increasing byte offsets in a UTF-8 buffer.
+
+    Walks forward from the previous lookup instead of indexing every line,
+    so a mapped file is never split into lines or decoded as a whole; only
+    the bytes between the last line start and ``offset`` are decoded to
+    count characters. \r\n, \r and \n each end one line. A byte that is not
+    valid UTF-8 counts as one character.
+    """
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self.offset = 0
+        self.line = 1
+        self.column = 1
+
+    def position(self, offset):
+        for m in NEWLINE_BYTES_REGEX.finditer(self.buffer, self.offset, offset):
+            self.line += 1
+            self.offset, self.column = m.end(), 1
+        self.column += len(self.buffer[self.offset:offset].decode("utf-8", "replace"))
+        self.offset = offset
+        return self.line, self.column
+
+
+# =============================
+# LEXER DEFINITIONS
+# =============================
+# Each family is one alternation scanned left to right with a single
+# finditer pass. Whatever token starts first wins, so "//" inside a string
+# literal is consumed as part of the string and never seen as a comment.
+# The leading lookahead lets the engine skip ordinary code quickly.
+C_STYLE_REGEX = re.compile(r'''
+    (?=[/"'`]) (?:
+        (?P<doc>/\*\*(?!/)) (?P<doc_body>[\s\S]*?) (?:\*/|\Z)
+      | (?P<block>/\*) (?P<block_body>[\s\S]*?) (?:\*/|\Z)
+      | (?P<line>//[^\r\n]*)
+      | """ (?P<tdq>[\s\S]*?) """
+      | \'\'\' (?P<tsq>[\s\S]*?) \'\'\'
+      | " (?P<dq>(?:[^"\\\r\n]|\\.)*) "
+      | ' (?P<sq>(?:[^'\\\r\n]|\\.)*) '
+      | ` (?P<bt>(?:[^`\\]|\\.)*) `
+    )
+''', re.VERBOSE)
+
+YAML_REGEX = re.compile(r'''
+    (?:^|(?<=[ \t])) (?P<comment>\#[^\r\n]*)
+  | " (?P<dq>(?:[^"\\\r\n]|\\.)*) "
+  | ' (?P<sq>(?:[^'\r\n]|'')*) '
+  | (?:(?<=:)|^[ \t]*-) [ \t]+ (?P<plain>[^\s\#"'|>][^\r\n]*?) [ \t]* (?=[ \t]\#|\r?$)
+''', re.VERBOSE | re.MULTILINE)
+
+PROPERTIES_REGEX = re.compile(r'''
+    ^[ \t]* (?P<comment>[\#!][^\r\n]*)
+  | ^[ \t]* [^\s=:\#!][^=:\r\n]*? [ \t]*[=:][ \t]* (?P<value>[^\r\n]*?) [ \t]* \r?$
+''', re.VERBOSE | re.MULTILINE)
+
+# XML / HTML: comments, CDATA sections, <script>/<style> elements (whose
+# bodies are code, lexed like C-style sources), tags (whose quoted attribute
+# values are lexed separately) and the text between tags.
+MARKUP_REGEX = re.compile(r'''
+    <!-- (?P<comment>[\s\S]*?) (?:-->|\Z)
+  | <!\[CDATA\[ (?P<cdata>[\s\S]*?) (?:\]\]>|\Z)
+  | (?P<raw_tag> <(?i:script|style)\b (?:"[^"]*"|'[^']*'|[^<>"'])* >)
+    (?P<raw>[\s\S]*?) (?:</(?i:script|style)[ \t\r\n]*>|\Z)
+  | (?P<tag> <[!?/]?[A-Za-z_:] (?:"[^"]*"|'[^']*'|[^<>"'])* >? )
+  | (?P<text>[^<]+)
+''', re.VERBOSE)
+
+ATTRIBUTE_REGEX = re.compile(r'''=[ \t\r\n]*(?:"(?P<dq>[^"]*)"|'(?P<sq>[^']*)')''')
+
+# The same patterns compiled for UTF-8 buffers (bytes or mmap). Every
+# delimiter they match is ASCII, and ASCII bytes never occur inside a UTF-8
+# multi-byte sequence, so token boundaries always fall between characters.
+BYTES_REGEXES = {
+    regex: re.compile(regex.pattern.encode("ascii"), regex.flags & ~re.UNICODE)
+    for regex in (LINE_REGEX, C_STYLE_REGEX, YAML_REGEX, PROPERTIES_REGEX,
+                  MARKUP_REGEX, ATTRIBUTE_REGEX)
+}
+
+
+def _regex(content, regex):
+    """``regex``, or its bytes twin when ``content`` is not a str."""
+    return regex if isinstance(content, str) else BYTES_REGEXES[regex]
+
+
+# =============================
+# TOKENIZERS
+# =============================
+def _trimmed(content, start, end, chars):
+    """Return (start, end) of content[start:end] with ``chars`` stripped."""
+    if not isinstance(content, str):
+        chars = chars.encode("ascii")
+    segment = content[start:end]
+    stripped = segment.lstrip(chars)
+    start += len(segment) - len(stripped)
+    return start, start + len(stripped.rstrip(chars))
+
+
+def _comment_lines(kind, content, start, end, chars=" \t*"):
+    """Split a block comment body into one span per line, without the ``*`` gutter."""
+    for line in _regex(content, LINE_REGEX).finditer(content, start, end):
+        s, e = _trimmed(content, line.start(), line.end(), chars)
+        if s < e:
+            yield Span(kind, s, e, content[s:e])
+
+
+def tokenize_c_style(content, start=0, end=None):
+    """Java / Groovy / TypeScript / Dart: comments and string literals.
+
+    ``start``/``end`` limit the lexing to part of ``content``, e.g. the body
+    of an HTML <script> element.
+    """
+    end = len(content) if end is None else end
+    for m in _regex(content, C_STYLE_REGEX).finditer(content, start, end):
+        group = m.lastgroup
+        if group in ("doc_body", "doc"):
+            yield from _comment_lines(DOC_COMMENT, content, m.start("doc_body"), m.end("doc_body"))
+        elif group in ("block_body", "block"):
+            yield from _comment_lines(BLOCK_COMMENT, content, m.start("block_body"), m.end("block_body"))
+        elif group == "line":
+            # Dart "///" comments are documentation
+            kind = DOC_COMMENT if m.group("line")[:3] in ("///", b"///") else LINE_COMMENT
+            s, e = _trimmed(content, m.start() + 2, m.end(), " \t/")
+            if s < e:
+                yield Span(kind, s, e, content[s:e])
+        elif m.start(group) < m.end(group):
+            yield Span(STRING_LITERAL, m.start(group), m.end(group), m.group(group))
+
+
+def tokenize_yaml(content):
+    """YAML: comments plus plain and quoted scalar values."""
+    for m in _regex(content, YAML_REGEX).finditer(content):
+        group = m.lastgroup
+        if group == "comment":
+            s, e = _trimmed(content, m.start() + 1, m.end(), " \t")
+            kind = LINE_COMMENT
+        else:
+            s, e = m.start(group), m.end(group)
+            kind = CONFIG_VALUE
+        if s < e:
+            yield Span(kind, s, e, content[s:e])
+
+
+def tokenize_properties(content):
+    """.properties: comments and ``key=value`` values."""
+    for m in _regex(content, PROPERTIES_REGEX).finditer(content):
+        if m.lastgroup == "comment":
+            s, e = _trimmed(content, m.start("comment") + 1, m.end("comment"), " \t")
+            kind = LINE_COMMENT
+        else:
+            s, e = m.start("value"), m.end("value")
+            kind = CONFIG_VALUE
+        if s < e:
+            yield Span(kind, s, e, content[s:e])
+
+
+def tokenize_markup(content):
+    """XML / HTML: comments, text between tags and quoted attribute values.
+
+    Comments and text are split into one span per line, like block comments.
+    The bodies of <script> and <style> elements are code: only their
+    comments and string literals are reported.
+    """
+    for m in _regex(content, MARKUP_REGEX).finditer(content):
+        group = m.lastgroup
+        if group == "comment":
+            yield from _comment_lines(BLOCK_COMMENT, content, m.start(group), m.end(group), " \t")
+        elif group in ("cdata", "text"):
+            yield from _comment_lines(MARKUP_TEXT, content, m.start(group), m.end(group), " \t")
+        elif group == "tag":
+            yield from _attribute_values(content, m.start(), m.end())
+        elif group == "raw":
+            yield from _attribute_values(content, m.start("raw_tag"), m.end("raw_tag"))
+            yield from tokenize_c_style(content, m.start("raw"), m.end("raw"))
+
+
+def _attribute_values(content, start, end):
+    """Quoted attribute values of the tag at content[start:end]."""
+    for attr in _regex(content, ATTRIBUTE_REGEX).finditer(content, start, end):
+        value = attr.lastgroup
+        if attr.start(value) < attr.end(value):
+            yield Span(STRING_LITERAL, attr.start(value), attr.end(value), attr.group(value))
+
+
+TOKENIZERS = {
+    ".java": tokenize_c_style,
+    ".groovy": tokenize_c_style,
+    ".ts": tokenize_c_style,
+    ".dart": tokenize_c_style,
+    ".json": tokenize_c_style,
+    ".arb": tokenize_c_style,
+    ".yml": tokenize_yaml,
+    ".yaml": tokenize_yaml,
+    ".properties": tokenize_properties,
+    ".xml": tokenize_markup,
+    ".html": tokenize_markup,
+}
+
+
+def tokenizer_for(path):
+    return TOKENIZERS.get(os.path.splitext(path)[1].lower())
+
+
+def extract_buffer_spans(buffer, path):
+    """Yield every span containing Japanese in a UTF-8 buffer (bytes or mmap).
+
+    The lexers run on the raw bytes and the Japanese check uses the byte
+    pattern, so only the text of matching spans is ever decoded. Text is
+    normalised to \\n newlines like text-mode reads; ``start``/``end`` stay
+    byte offsets into ``buffer``. Bytes that are not valid UTF-8 decode to
+    U+FFFD rather than failing the file (and with it the whole scan).
+    """
+    tokenize = tokenizer_for(path)
+    if tokenize is None:
+        return
+    cursor = LineCursor(buffer)
+    for span in tokenize(buffer):
+        if JAPANESE_BYTES_REGEX.search(span.text):
+            line, column = cursor.position(span.start)
+            text = span.text.decode("utf-8", "replace").replace("\r\n", "\n").replace("\r", "\n")
+            yield span._replace(text=text, line=line, column=column)
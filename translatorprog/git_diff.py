@@ -0,0 +1,166 @@
+import codecs
+import errno
+import os
+import re
+import subprocess
+from collections import namedtuple
+
+from .extractors import extract_buffer_spans, tokenizer_for
+from .prefilter import JAPANESE_BYTES_REGEX
+
+# =============================
+# ADDED LINES
+# =============================
+# Unified diffs with no context lines: every "+" line in a hunk is an
+# addition, numbered from the "+start" of its hunk header.
+HUNK_REGEX = re.compile(rb'^@@ -\d+(?:,\d+)? \+(\d+)(?:,\d+)? @@')
+
+# Tree of an empty commit, the base of a diff in a repository without HEAD.
+EMPTY_TREE = "4b825dc642cb6eb9a060e54bf8d69288fbee4904"
+
+# Plumbing diff commands ignore the user's diff.* configuration (relative
+# paths, prefixes, textconv, external drivers), so paths always come out
+# relative to the top level.
+DIFF_OPTIONS = ("-p", "-U0", "--no-prefix", "--no-color", "--no-textconv", "--no-ext-diff",
+                "--diff-filter=d")
+
+# One Japanese span on an added line; ``line``/``column`` are in the new file.
+Finding = namedtuple("Finding", ["path", "line", "column", "kind", "text"])
+
+
+def _git(repo, *args):
+    """Run a git command in ``repo`` and return its stdout as bytes."""
+    return subprocess.run(["git", "-C", repo, "-c", "core.quotePath=off", *args],
+                          check=True, stdout=subprocess.PIPE).stdout
+
+
+def _path(raw):
+    """Decode a diff header path, undoing git's C-style quoting."""
+    if raw.startswith(b'"'):
+        raw = codecs.escape_decode(raw[1:-1])[0]
+    return raw.decode("utf-8")
+
+
+def added_lines(diff):
+    """Map each file in a ``-U0 --no-prefix`` diff to {line_number: added bytes}."""
+    added = {}
+    lines = None
+    line_no = 0
+    in_header = False
+    for raw in diff.split(b"\n"):
+        if raw.startswith(b"diff --git "):
+            in_header, lines = True, None
+        elif in_header:
+            if raw.startswith(b"+++ "):
+                # git appends a tab to names containing spaces
+                target = raw[4:].rstrip(b"\t")
+                lines = None if target == b"/dev/null" else added.setdefault(_path(target), {})
+            elif raw.startswith(b"@@"):
+                in_header = False
+                line_no = int(HUNK_REGEX.match(raw).group(1))
+        elif raw.startswith(b"@@"):
+            line_no = int(HUNK_REGEX.match(raw).group(1))
+        elif raw.startswith(b"+") and lines is not None:
+            lines[line_no] = raw[1:]
+            line_no += 1
+    return {path: lines for path, lines in added.items() if lines}
+
+
+def _split_range(repo, spec):
+    """(base, head) for an ``A..B`` or ``A...B`` (merge base) range."""
+    symmetric = "..." in spec
+    base, head = spec.split("..." if symmetric else "..", 1)
+    base, head = base or "HEAD", head or "HEAD"
+    if symmetric:
+        base = _git(repo, "merge-base", base, head).decode("ascii").strip()
+    return base, head
+
+
+def _diff(repo, revisions, cached):
+    """The -U0 patch selected like ``git diff``, produced by plumbing commands."""
+    if len(revisions) == 2:
+        return _git(repo, "diff-tree", "-r", *DIFF_OPTIONS, *revisions, "--")
+    if not revisions and not cached:
+        return _git(repo, "diff-files", *DIFF_OPTIONS, "--")
+    base = revisions[0] if revisions else "HEAD"
+    if not revisions:
+        try:
+            _git(repo, "rev-parse", "--verify", "--quiet", "HEAD")
+        except subprocess.CalledProcessError:
+            base = EMPTY_TREE   # nothing committed yet
+    return _git(repo, "diff-index", *DIFF_OPTIONS, *(["--cached"] if cached else []), base, "--")
+
+
+# =============================
+# FILE CONTENTS
+# =============================
+def read_blobs(repo, revision, paths):
+    """Contents of ``paths`` at ``revision`` ("" for the index) in one git call."""
+    request = b"".join(f"{revision}:{path}\n".encode("utf-8") for path in paths)
+    out = subprocess.run(["git", "-C", repo, "cat-file", "--batch"], input=request,
+                         check=True, stdout=subprocess.PIPE).stdout
+    blobs, pos = {}, 0
+    for path in paths:
+        end = out.index(b"\n", pos)
+        header = out[pos:end].split()
+        pos = end + 1
+        if header[-1] == b"missing":
+            continue
+        size = int(header[2])
+        blobs[path] = out[pos:pos + size]
+        pos += size + 1
+    return blobs
+
+
+# =============================
+# CHECK
+# =============================
+def diff_findings(repo=".", revisions=(), cached=False, extensions=None):
+    """Yield a Finding for every Japanese span on a line the diff adds.
+
+    ``revisions`` and ``cached`` select the diff the way ``git diff`` does:
+    nothing compares the working tree with the index, ``cached`` the index
+    with HEAD, one revision that revision with the working tree (or index),
+    two revisions one with the other. Only files whose added lines contain
+    Japanese bytes are read; those are lexed whole, so a line inside a block
+    comment or multi-line string is still classified correctly, and only
+    spans touching an added line are reported. ``A..B`` and ``A...B``
+    ranges are accepted as in ``git diff``.
+
+    Raises OSError if a file with added Japanese cannot be read, so the
+    check fails instead of passing.
+    """
+    if len(revisions) > 2:
+        raise ValueError("Give at most two revisions")
+    if len(revisions) == 1 and ".." in revisions[0]:
+        revisions = _split_range(repo, revisions[0])
+    diff = _diff(repo, revisions, cached)
+
+    candidates = {}
+    for path, lines in added_lines(diff).items():
+        if tokenizer_for(path) is None or (extensions and not path.endswith(tuple(extensions))):
+            continue
+        if any(JAPANESE_BYTES_REGEX.search(line) for line in lines.values()):
+            candidates[path] = lines
+    if not candidates:
+        return
+
+    top = _git(repo, "rev-parse", "--show-toplevel").decode("utf-8").strip()
+    if len(revisions) == 2:
+        blobs = read_blobs(top, revisions[1], list(candidates))
+    elif cached:
+        blobs = read_blobs(top, "", list(candidates))
+    else:
+        blobs = {}
+        for path in candidates:
+            with open(os.path.join(top, path), "rb") as f:
+                blobs[path] = f.read()
+
+    for path, lines in candidates.items():
+        content = blobs.get(path)
+        if content is None:
+            raise FileNotFoundError(errno.ENOENT, "not found in the diffed version", path)
+        for span in extract_buffer_spans(content, path):
+            last = span.line + span.text.count("\n")
+            if any(line in lines for line in range(span.line, last + 1)):
+                yield Finding(path, span.line, span.column, span.kind, span.text)
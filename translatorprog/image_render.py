@@ -0,0 +1,174 @@
+import os
+from collections import deque, namedtuple
+from functools import lru_cache
+from itertools import chain, groupby
+
+# PIL is imported inside the functions that draw, so importing this module
+# costs nothing until an image is rendered.
+
+# =============================
+# CONFIGURATION
+# =============================
+MIN_FONT_SIZE = 5
+
+# One translated text to paint over the image, at the OCR box it came from.
+Overlay = namedtuple("Overlay", ["x", "y", "w", "h", "text"])
+
+
+def group_overlays(rows):
+    """Yield (file, [Overlay, ...]) per run of report rows on the same image.
+
+    Rows are ``[file, x, y, w, h, japanese, english, ...]``; only one
+    image's overlays are held at a time.
+    """
+    for filename, run in groupby(rows, key=lambda row: row[0]):
+        yield filename, [Overlay(int(x), int(y), int(w), int(h), english_text or "")
+                         for _, x, y, w, h, _, english_text, *_ in run]
+
+
+# =============================
+# DRAWING
+# =============================
+@lru_cache(maxsize=None)
+def load_font(font_path, size):
+    """TrueType font, parsed once per (path, size) in each process."""
+    from PIL import ImageFont
+
+    return ImageFont.truetype(font_path, size)
+
+
+def line_height(font):
+    ascent, descent = font.getmetrics()
+    return ascent + descent
+
+
+def wrap_text(text, font, width):
+    """Greedy word wrap of ``text`` to ``width`` pixels.
+
+    Words wider than the box, including unspaced CJK runs, are broken
+    between characters.
+    """
+    lines = []
+    for paragraph in text.split("\n"):
+        line = ""
+        for word in paragraph.split(" "):
+            candidate = f"{line} {word}" if line else word
+            if font.getlength(candidate) <= width:
+                line = candidate
+                continue
+            if line:
+                lines.append(line)
+                line = ""
+            for char in word:
+                if line and font.getlength(line + char) > width:
+                    lines.append(line)
+                    line = char
+                else:
+                    line += char
+        lines.append(line)
+    return lines
+
+
+def fit_text(text, width, height, font_path, max_size):
+    """(font, lines) for the largest size whose wrapped ``text`` fits the box.
+
+    Binary search over font sizes from MIN_FONT_SIZE to ``max_size``; text
+    that does not fit even at the minimum is wrapped at the minimum and
+    allowed to overflow.
+    """
+    low, high = MIN_FONT_SIZE, max(max_size, MIN_FONT_SIZE)
+    best = None
+    while low <= high:
+        size = (low + high) // 2
+        font = load_font(font_path, size)
+        lines = wrap_text(text, font, width)
+        fits = (len(lines) * line_height(font) <= height
+                and all(font.getlength(line) <= width for line in lines))
+        if fits:
+            best = font, lines
+            low = size + 1
+        else:
+            high = size - 1
+    if best is None:
+        font = load_font(font_path, MIN_FONT_SIZE)
+        best = font, wrap_text(text, font, width)
+    return best
+
+
+def render_image(source, target, overlays, font_path, font_size, fit=False):
+    """Paint every overlay onto one decoded copy of ``source`` and save it once.
+
+    Each box is covered in white and its translation drawn at its top-left
+    corner, at ``font_size`` or, with ``fit``, wrapped and sized to fill the
+    box. Returns ``target``.
+    """
+    from PIL import Image, ImageDraw
+
+    with Image.open(source) as img:
+        canvas = img if img.mode in ("RGB", "RGBA") else img.convert("RGB")
+        draw = ImageDraw.Draw(canvas)
+        for overlay in overlays:
+            x, y, w, h = overlay.x, overlay.y, overlay.w, overlay.h
+            # Cover original Japanese text
+            draw.rectangle([x, y, x + w, y + h], fill="white")
+            if fit:
+                font, lines = fit_text(overlay.text, w, h, font_path, font_size)
+            else:
+                font, lines = load_font(font_path, font_size), [overlay.text]
+            for i, line in enumerate(lines):
+                draw.text((x, y + i * line_height(font)), line, fill="black", font=font)
+        canvas.save(target)
+    return target
+
+
+def _render_job(job):
+    return render_image(*job)
+
+
+def render_images(rows, images_folder, output_folder, font_path, font_size,
+                  fit=False, workers=None):
+    """Render every image in the report rows, one image per worker task.
+
+    Rows are streamed, e.g. from read_image_report(): each image's overlays
+    are grouped as its rows go by and at most two images per worker are
+    queued, so memory does not depend on the size of the report. An image's
+    rows are expected together, as the report writes them; if review sorted
+    them apart, each later run is drawn over the image's first output.
+    Output paths are yielded in report order as images finish. ``workers=1``
+    renders in the calling process.
+    """
+    os.makedirs(output_folder, exist_ok=True)
+    rendered = set()
+
+    def plan():
+        """Yield (job, repeat); a repeat draws over the image's first output."""
+        for filename, overlays in group_overlays(rows):
+            repeat = filename in rendered
+            rendered.add(filename)
+            target = os.path.join(output_folder, filename)
+            source = target if repeat else os.path.join(images_folder, filename)
+            yield (source, target, overlays, font_path, font_size, fit), repeat
+
+    jobs = plan()
+    first = next(jobs, None)
+    second = next(jobs, None)
+    if workers == 1 or second is None:
+        for job, _ in chain(filter(None, (first, second)), jobs):
+            yield _render_job(job)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        inflight = deque()
+        for job, repeat in chain((first, second), jobs):
+            if repeat:
+                # The first output must be saved before it is drawn over
+                while inflight:
+                    yield inflight.popleft().result()
+            elif len(inflight) >= workers * 2:
+                yield inflight.popleft().result()
+            inflight.append(pool.submit(_render_job, job))
+        while inflight:
+            yield inflight.popleft().result()
@@ -0,0 +1,116 @@
+import csv
+
+# openpyxl is imported only when an XLSX report is requested.
+
+# =============================
+# REPORT ROWS
+# =============================
+IMAGE_REPORT_FIELDS = ["Image File", "X", "Y", "Width", "Height", "Japanese Text",
+                       "English Translation", "Reused From"]
+JAPANESE_COLUMN = IMAGE_REPORT_FIELDS.index("Japanese Text")
+ENGLISH_COLUMN = IMAGE_REPORT_FIELDS.index("English Translation")
+
+FLUSH_EVERY = 1000   # rows between CSV flushes
+
+# Named cell styles shared by every highlighted cell in the XLSX
+JAPANESE_STYLE = ("japanese_text", "FFFF99")   # yellow
+ENGLISH_STYLE = ("english_text", "99CCFF")     # blue
+
+
+def read_image_report(path):
+    """Yield the rows of a reviewed .csv or .xlsx report as lists, header skipped.
+
+    Both formats are streamed (the XLSX through openpyxl's read-only mode),
+    so reading a large report does not load it whole.
+    """
+    if path.lower().endswith(".xlsx"):
+        from openpyxl import load_workbook
+
+        wb = load_workbook(path, read_only=True)
+        try:
+            for row in wb.active.iter_rows(min_row=2, values_only=True):
+                yield list(row)
+        finally:
+            wb.close()
+        return
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        yield from reader
+
+
+# =============================
+# STREAMING WRITER
+# =============================
+class ImageReportWriter:
+    """Streams OCR report rows into a CSV, an XLSX, or both from one pass.
+
+    The XLSX is built with openpyxl's write-only mode: each appended row is
+    serialised to a temporary sheet file straight away instead of being kept
+    as cell objects, and the Japanese and English columns point at two named
+    styles rather than carrying a fill each, so memory stays flat however
+    many rows are written. An XLSX can only be finalised as a whole, so it is
+    saved on close, also when the run fails part-way.
+
+    The CSV is flushed every ``flush_every`` rows; an interrupted run leaves
+    everything up to the last flush on disk.
+    """
+
+    def __init__(self, csv_path=None, xlsx_path=None, flush_every=FLUSH_EVERY,
+                 sheet_title="OCR Translation Report"):
+        self.csv_path = csv_path
+        self.xlsx_path = xlsx_path
+        self.flush_every = flush_every
+        self.rows_written = 0
+
+        self.f = self.writer = None
+        if csv_path is not None:
+            self.f = open(csv_path, "w", newline="", encoding="utf-8")
+            self.writer = csv.writer(self.f)
+            self.writer.writerow(IMAGE_REPORT_FIELDS)
+
+        self.wb = self.ws = None
+        if xlsx_path is not None:
+            self.open_workbook(sheet_title)
+
+    def open_workbook(self, sheet_title):
+        from openpyxl import Workbook
+        from openpyxl.styles import NamedStyle, PatternFill
+        from openpyxl.cell import WriteOnlyCell
+
+        self.wb = Workbook(write_only=True)
+        for name, color in (JAPANESE_STYLE, ENGLISH_STYLE):
+            self.wb.add_named_style(NamedStyle(name=name, fill=PatternFill(
+                start_color=color, end_color=color, fill_type="solid")))
+        self.ws = self.wb.create_sheet(sheet_title)
+        self.ws.append(IMAGE_REPORT_FIELDS)
+        self.cell = WriteOnlyCell
+
+    def styled(self, value, style):
+        cell = self.cell(self.ws, value=value)
+        cell.style = style
+        return cell
+
+    def write(self, row):
+        if self.writer is not None:
+            self.writer.writerow(row)
+        if self.ws is not None:
+            row = list(row)
+            row[JAPANESE_COLUMN] = self.styled(row[JAPANESE_COLUMN], JAPANESE_STYLE[0])
+            row[ENGLISH_COLUMN] = self.styled(row[ENGLISH_COLUMN], ENGLISH_STYLE[0])
+            self.ws.append(row)
+        self.rows_written += 1
+        if self.f is not None and self.rows_written % self.flush_every == 0:
+            self.f.flush()
+
+    def close(self):
+        if self.f is not None:
+            self.f.close()
+        if self.wb is not None:
+            self.wb.save(self.xlsx_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
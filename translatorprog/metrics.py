@@ -0,0 +1,173 @@
+import json
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# =============================
+# CONFIGURATION
+# =============================
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket
+# is +Inf.
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+PROMETHEUS_PREFIX = "translatorprog_"
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+# =============================
+# HISTOGRAM
+# =============================
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus sense."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self):
+        """(upper bound, observations <= bound) pairs, ending with +Inf."""
+        total = 0
+        for bound, count in zip((*self.buckets, float("inf")), self.counts):
+            total += count
+            yield bound, total
+
+
+# =============================
+# METRICS
+# =============================
+class Metrics:
+    """Counters, latency histograms and wall time per phase for one run.
+
+    ``count()`` and ``observe()`` are thread-safe, so translation workers can
+    report API calls. Phases are timed with ``with metrics.phase(name)``
+    from the main thread; they nest, and each phase is charged only its own
+    time, so a phase that pulls files from a nested "walk" does not count
+    the walk twice. Export with ``to_json()`` or ``to_prometheus()``.
+    """
+
+    def __init__(self):
+        self.counters = {}
+        self.histograms = {}
+        self.phases = {}
+        self.lock = threading.Lock()
+        self.stack = []     # [name, start, time spent in nested phases]
+
+    def count(self, name, value=1, **labels):
+        key = _key(name, labels)
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        key = _key(name, labels)
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+
+    @contextmanager
+    def phase(self, name):
+        frame = [name, time.perf_counter(), 0.0]
+        self.stack.append(frame)
+        try:
+            yield
+        finally:
+            self.stack.pop()
+            elapsed = time.perf_counter() - frame[1]
+            self.phases[name] = self.phases.get(name, 0.0) + elapsed - frame[2]
+            if self.stack:
+                self.stack[-1][2] += elapsed
+
+    def timed(self, name, iterable, profiler=None):
+        """Iterate ``iterable``, charging the time spent producing items to phase ``name``.
+
+        With a ``profiler`` (e.g. cProfile.Profile), it is enabled only while
+        items are being produced.
+        """
+        iterator = iter(iterable)
+        while True:
+            with self.phase(name):
+                if profiler is not None:
+                    profiler.enable()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    if profiler is not None:
+                        profiler.disable()
+            yield item
+
+    # =============================
+    # EXPORT
+    # =============================
+    def to_dict(self):
+        def labelled(key):
+            name, labels = key
+            return {"name": name, "labels": dict(labels)}
+
+        return {
+            "phases_seconds": {name: round(seconds, 6) for name, seconds in self.phases.items()},
+            "counters": [{**labelled(key), "value": value}
+                         for key, value in sorted(self.counters.items())],
+            "histograms": [{**labelled(key), "count": h.count, "sum": round(h.sum, 6),
+                            "buckets": {("+Inf" if bound == float("inf") else str(bound)): total
+                                        for bound, total in h.cumulative()}}
+                           for key, h in sorted(self.histograms.items())],
+        }
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self):
+        """Prometheus text exposition format (version 0.0.4)."""
+        def labels_text(labels, extra=()):
+            pairs = [*labels, *extra]
+            if not pairs:
+                return ""
+            escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+                       for _, value in pairs)
+            return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + "}"
+
+        lines = []
+        name = PROMETHEUS_PREFIX + "phase_seconds"
+        lines += [f"# TYPE {name} gauge"]
+        lines += [f'{name}{{phase="{phase}"}} {seconds:.6f}' for phase, seconds in self.phases.items()]
+
+        typed = set()
+        for (metric, labels), value in sorted(self.counters.items()):
+            name = PROMETHEUS_PREFIX + metric
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} counter")
+            lines.append(f"{name}{labels_text(labels)} {value}")
+
+        for (metric, labels), h in sorted(self.histograms.items()):
+            name = PROMETHEUS_PREFIX + metric
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} histogram")
+            for bound, total in h.cumulative():
+                le = "+Inf" if bound == float("inf") else str(bound)
+                lines.append(f"{name}_bucket{labels_text(labels, [('le', le)])} {total}")
+            lines.append(f"{name}_sum{labels_text(labels)} {h.sum:.6f}")
+            lines.append(f"{name}_count{labels_text(labels)} {h.count}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path, format=None):
+        """Write to ``path`` as "json" or "prometheus" (default: by extension, .prom)."""
+        if format is None:
+            format = "prometheus" if path.endswith((".prom", ".txt")) else "json"
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus() if format == "prometheus" else self.to_json() + "\n")
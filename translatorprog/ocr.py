@@ -0,0 +1,382 @@
+import os
+from collections import deque, namedtuple
+from contextlib import nullcontext
+from functools import partial
+
+# PIL and pytesseract are imported inside the functions that need them, so
+# importing this module costs nothing until an image is actually read.
+
+# =============================
+# CONFIGURATION
+# =============================
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg")
+OCR_LANG = "jpn"
+
+# Region levels for group_words()
+WORD = "word"
+LINE = "line"
+PARAGRAPH = "paragraph"
+
+# One recognised word; coordinates are pixels in the original image.
+# ``block``/``par``/``line`` are tesseract's layout numbers.
+WordBox = namedtuple("WordBox", ["text", "x", "y", "w", "h", "block", "par", "line"],
+                     defaults=(0, 0, 0))
+
+# Words merged into one line or paragraph, with their union bounding box.
+# ``phash`` is the perceptual hash of the region's crop (see dhash()).
+TextRegion = namedtuple("TextRegion", ["text", "x", "y", "w", "h", "words", "phash"],
+                        defaults=(0,))
+
+# Perceptual-hash dedup: hashes within DEDUP_THRESHOLD differing bits count
+# as the same picture. Whole images get a finer hash than text regions, so
+# one screenshot in two UI states is less likely to be taken for the other.
+IMAGE_HASH_SIZE = 16    # 256-bit hash per image
+REGION_HASH_SIZE = 8    # 64-bit hash per text region crop
+DEDUP_THRESHOLD = 2
+
+
+def list_images(folder, extensions=IMAGE_EXTENSIONS):
+    """Image file names in ``folder``, sorted so reports stay diff-stable."""
+    if not os.path.isdir(folder):
+        return []
+    return sorted(f for f in os.listdir(folder) if f.lower().endswith(extensions))
+
+
+# =============================
+# PREPROCESSING
+# =============================
+def otsu_threshold(histogram):
+    """Grey level that best separates a 256-bin histogram into two classes."""
+    total = sum(histogram)
+    weighted_total = sum(level * count for level, count in enumerate(histogram))
+    best, best_variance = 127, -1.0
+    background = weighted_background = 0
+    for level, count in enumerate(histogram):
+        background += count
+        if background == 0:
+            continue
+        foreground = total - background
+        if foreground == 0:
+            break
+        weighted_background += level * count
+        mean_background = weighted_background / background
+        mean_foreground = (weighted_total - weighted_background) / foreground
+        variance = background * foreground * (mean_background - mean_foreground) ** 2
+        if variance > best_variance:
+            best, best_variance = level, variance
+    return best
+
+
+def binarize(img):
+    """Grayscale ``img`` and threshold it to black text on a white background.
+
+    The threshold is picked per image (Otsu), and images that are mostly dark,
+    e.g. dark-mode screenshots, are inverted, since tesseract reads dark text
+    on a light background best.
+    """
+    gray = img.convert("L")
+    histogram = gray.histogram()
+    threshold = otsu_threshold(histogram)
+    dark = sum(histogram[:threshold + 1]) > sum(histogram) / 2
+    if dark:
+        lut = [255 if level <= threshold else 0 for level in range(256)]
+    else:
+        lut = [0 if level <= threshold else 255 for level in range(256)]
+    return gray.point(lut)
+
+
+# =============================
+# PERCEPTUAL HASHING
+# =============================
+def dhash(img, size=REGION_HASH_SIZE):
+    """Difference hash of ``img``: size * size bits as an int.
+
+    Each bit compares two horizontally adjacent pixels of a grayscale
+    (size + 1) x size thumbnail, so the hash survives rescaling, compression
+    and small colour shifts but changes when the content does.
+    """
+    from PIL import Image
+
+    pixels = img.convert("L").resize((size + 1, size), Image.Resampling.BILINEAR).tobytes()
+    bits = 0
+    for row in range(size):
+        offset = row * (size + 1)
+        for col in range(size):
+            bits = (bits << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return bits
+
+
+def hamming(a, b):
+    return bin(a ^ b).count("1")
+
+
+class HashIndex:
+    """Finds an earlier hash within ``threshold`` differing bits.
+
+    Hashes are cut into threshold + 1 bands. Two hashes that differ in at
+    most ``threshold`` bits agree exactly on at least one band, so only
+    entries sharing a band are compared instead of every earlier hash.
+    """
+
+    def __init__(self, bits, threshold):
+        self.threshold = threshold
+        width = -(-bits // (threshold + 1))
+        self.bands = [(shift, (1 << min(width, bits - shift)) - 1) for shift in range(0, bits, width)]
+        self.tables = [{} for _ in self.bands]
+
+    def keys(self, phash):
+        return [(phash >> shift) & mask for shift, mask in self.bands]
+
+    def find(self, phash, accept=None):
+        """Value of the first close-enough entry that ``accept`` (if given) allows."""
+        for table, key in zip(self.tables, self.keys(phash)):
+            for other, value in table.get(key, ()):
+                if hamming(phash, other) <= self.threshold and (accept is None or accept(value)):
+                    return value
+        return None
+
+    def add(self, phash, value):
+        for table, key in zip(self.tables, self.keys(phash)):
+            table.setdefault(key, []).append((phash, value))
+
+
+def image_signature(path):
+    """(path, (width, height), dhash) of an image file, for deduplication."""
+    from PIL import Image
+
+    with Image.open(path) as img:
+        size = img.size
+        # JPEGs are decoded at reduced scale; a no-op for other formats
+        img.draft("L", (IMAGE_HASH_SIZE * 8, IMAGE_HASH_SIZE * 8))
+        return path, size, dhash(img, IMAGE_HASH_SIZE)
+
+
+# =============================
+# OCR
+# =============================
+def ocr_image(path, lang=OCR_LANG, preprocess=True, level=LINE):
+    """OCR one image file and return (path, [TextRegion, ...]).
+
+    Words are merged with group_words() and each region gets the perceptual
+    hash of its crop from the original image. Runs in worker processes, so
+    it takes a path rather than an open image.
+    """
+    from PIL import Image
+    import pytesseract
+
+    with Image.open(path) as img:
+        gray = img.convert("L")
+        data = pytesseract.image_to_data(binarize(gray) if preprocess else img.convert("RGB"),
+                                         lang=lang, output_type=pytesseract.Output.DICT)
+        boxes = []
+        for i, text in enumerate(data["text"]):
+            text = text.strip()
+            if text:
+                boxes.append(WordBox(text, data["left"][i], data["top"][i],
+                                     data["width"][i], data["height"][i],
+                                     data["block_num"][i], data["par_num"][i], data["line_num"][i]))
+        regions = [region._replace(phash=dhash(gray.crop((region.x, region.y, region.x + region.w,
+                                                          region.y + region.h))))
+                   for region in group_words(boxes, level)]
+    return path, regions
+
+
+def ocr_images(paths, workers=None, lang=OCR_LANG, preprocess=True, level=LINE,
+               dedup_threshold=None):
+    """OCR ``paths`` on a process pool, yielding (path, regions, original).
+
+    Each tesseract call is its own process already; the pool keeps one per
+    core busy and also spreads the decoding and binarization. Results are
+    yielded in input order as soon as they are next, so callers can stream
+    them into a report. ``workers=1`` runs in the calling process.
+
+    With a ``dedup_threshold``, every image is perceptually hashed first, and
+    an image of the same size whose hash is within the threshold of an
+    earlier one is not OCR'd: it gets the earlier image's regions and its
+    path as ``original``. ``original`` is None for images that were read.
+    """
+    paths = list(paths)
+    if workers != 1:
+        import pytesseract
+
+        # Fail here with tesseract's own error; raised in a worker it does
+        # not survive pickling and would surface as a BrokenProcessPool.
+        pytesseract.get_tesseract_version()
+        from concurrent.futures import ProcessPoolExecutor
+        pool_context = ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1)
+    else:
+        pool_context = nullcontext()
+
+    with pool_context as pool:
+        run = pool.map if pool is not None else map
+        originals = {}
+        if dedup_threshold is not None:
+            index = HashIndex(IMAGE_HASH_SIZE * IMAGE_HASH_SIZE, dedup_threshold)
+            for path, size, phash in run(image_signature, paths):
+                match = index.find(phash, accept=lambda entry: entry[1] == size)
+                if match is None:
+                    index.add(phash, (path, size))
+                else:
+                    originals[path] = match[0]
+
+        results = run(partial(ocr_image, lang=lang, preprocess=preprocess, level=level),
+                      [path for path in paths if path not in originals])
+        reused = set(originals.values())
+        kept = {}
+        for path in paths:
+            if path in originals:
+                yield path, kept[originals[path]], originals[path]
+                continue
+            _, regions = next(results)
+            if path in reused:
+                kept[path] = regions
+            yield path, regions, None
+
+
+# =============================
+# GROUPING
+# =============================
+def join_words(left, right):
+    """Join two OCR fragments, with a space only between non-CJK text."""
+    if not left:
+        return right
+    if left[-1].isascii() and right[:1].isascii():
+        return f"{left} {right}"
+    return left + right
+
+
+def group_words(boxes, level=LINE):
+    """Merge word boxes into TextRegions, one per line or paragraph.
+
+    Words are grouped on tesseract's block/paragraph/line numbers, kept in
+    reading order, and the region's box is the union of its words' boxes.
+    With ``level=WORD`` every word is its own region.
+    """
+    if level == WORD:
+        return [TextRegion(box.text, box.x, box.y, box.w, box.h, 1) for box in boxes]
+    if level not in (LINE, PARAGRAPH):
+        raise ValueError(f"Unknown OCR grouping {level!r}; choose one of {WORD}, {LINE}, {PARAGRAPH}")
+
+    groups = {}
+    for box in boxes:
+        key = (box.block, box.par) if level == PARAGRAPH else (box.block, box.par, box.line)
+        groups.setdefault(key, []).append(box)
+
+    regions = []
+    for words in groups.values():
+        text = ""
+        for word in words:
+            text = join_words(text, word.text)
+        left = min(word.x for word in words)
+        top = min(word.y for word in words)
+        right = max(word.x + word.w for word in words)
+        bottom = max(word.y + word.h for word in words)
+        regions.append(TextRegion(text, left, top, right - left, bottom - top, len(words)))
+    return regions
+
+
+# =============================
+# TRANSLATION
+# =============================
+def translate_regions(results, translator, dedup_threshold=None):
+    """Yield (path, TextRegion, translation, reused_from) for streamed OCR results.
+
+    ``results`` are (path, regions, original) triples as yielded by
+    ocr_images(). Each region's text is queued on ``translator`` (a
+    BatchTranslator), so regions are translated in batches, each unique text
+    once, while OCR continues. Regions are yielded in OCR order as soon as
+    their translation is in.
+
+    ``reused_from`` says where a region's text came from when it was not
+    read fresh: the original image of a duplicate, or, with a
+    ``dedup_threshold``, an earlier region of about the same size whose crop
+    hash is within the threshold, e.g. a button reused across screens. Such
+    a region takes the earlier text, and so its translation, even if OCR
+    read it slightly differently. It is "" otherwise.
+    """
+    index = None
+    if dedup_threshold is not None:
+        index = HashIndex(REGION_HASH_SIZE * REGION_HASH_SIZE, dedup_threshold)
+    waiting = deque()
+
+    def ready():
+        while waiting and waiting[0][1].text in translator.translations:
+            path, region, reused_from = waiting.popleft()
+            yield path, region, translator.translations[region.text], reused_from
+
+    for path, regions, original in results:
+        for region in regions:
+            reused_from = ""
+            if original is not None:
+                reused_from = os.path.basename(original)
+            elif index is not None:
+                match = index.find(region.phash, accept=lambda entry: similar_size(entry[1], region))
+                if match is None:
+                    index.add(region.phash, (path, region))
+                else:
+                    earlier_path, earlier = match
+                    region = region._replace(text=earlier.text)
+                    reused_from = f"{os.path.basename(earlier_path)} ({earlier.x}, {earlier.y})"
+            translator.add(region.text)
+            waiting.append((path, region, reused_from))
+        yield from ready()
+    translator.translate_all()
+    yield from ready()
+
+
+def similar_size(a, b, tolerance=0.1):
+    """True if two regions' widths and heights differ by at most ``tolerance``."""
+    return (abs(a.w - b.w) <= tolerance * max(a.w, b.w)
+            and abs(a.h - b.h) <= tolerance * max(a.h, b.h))
+
+
+# =============================
+# REPORT
+# =============================
+def ocr_and_translate(paths, translator, report, workers=None, level=LINE, dedup_threshold=None):
+    """OCR and translate ``paths``, writing one row per region to ``report``.
+
+    ``report`` is an ImageReportWriter (see image_report.py). Rows are
+    written as their translations arrive and are not kept, so memory does
+    not grow with the size of the report; render from the written report.
+    Returns the number of rows written.
+    """
+    results = ocr_images(paths, workers=workers, level=level, dedup_threshold=dedup_threshold)
+    rows = 0
+    for path, region, translation, reused_from in translate_regions(results, translator,
+                                                                    dedup_threshold):
+        report.write([os.path.basename(path), region.x, region.y, region.w, region.h,
+                      region.text, translation, reused_from])
+        rows += 1
+    return rows
+
+
+def translate_images(paths, report, backend="deepl", auth_key=None, memory_path=None,
+                     source_lang="JA", target_lang="EN-US", workers=None, level=LINE,
+                     dedup_threshold=None):
+    """OCR ``paths`` and translate them into ``report`` with a named backend.
+
+    ``backend`` is one of translation_backends.BACKENDS ("deepl", "memory"
+    or the offline "fake"). Translations are kept exactly as the backend
+    returns them. With ``memory_path`` they are looked up in, and saved to,
+    a TranslationMemory, under its unprocessed entries. Returns the closed
+    BatchTranslator, for its counters.
+    """
+    from .translation_backends import create_backend
+    from .translation_engine import BatchTranslator
+    from .translation_memory import RAW_VERSION, TranslationMemory
+
+    memory = TranslationMemory(memory_path, version=RAW_VERSION) if memory_path else None
+    try:
+        engine = BatchTranslator(create_backend(backend, auth_key=auth_key, memory=memory),
+                                 source_lang=source_lang, target_lang=target_lang,
+                                 postprocess=lambda text: text, memory=memory)
+        try:
+            ocr_and_translate(paths, engine, report, workers=workers, level=level,
+                              dedup_threshold=dedup_threshold)
+        finally:
+            engine.close()
+    finally:
+        if memory is not None:
+            memory.close()
+    return engine
@@ -0,0 +1,118 @@
+import os
+import re
+from collections import Counter
+from itertools import groupby
+
+from .extractors import CONFIG_VALUE, TOKENIZERS
+from .metrics import Metrics
+from .report_writer import ReportRow, StreamingReportWriter, read_report, report_row
+from .scanner import discover_files, scan_files
+
+# =============================
+# CONFIGURATION
+# =============================
+DEFAULT_EXTENSIONS = tuple(TOKENIZERS)
+DEFAULT_IGNORE_DIRS = (".git", "build", "dist", "target", "node_modules", ".dart_tool", ".angular")
+
+EMAIL_REGEX = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+
+# =============================
+# SCAN
+# =============================
+def scan_project(project_path, report_csv, engine=None, extensions=DEFAULT_EXTENSIONS,
+                 ignore_dirs=DEFAULT_IGNORE_DIRS, workers=None, manifest=None,
+                 resume=False, skip_emails=False, skip_patterns=(), metrics=None, profiler=None):
+    """Scan ``project_path`` and stream every Japanese span into ``report_csv``.
+
+    With a BatchTranslator ``engine`` the English column is filled in as
+    translations come back; without one it is left empty for ``translate``.
+    ``skip_emails`` drops config values that are e-mail addresses, and
+    ``skip_patterns`` any span containing one of the given substrings (e.g.
+    ``$`` or ``{`` for interpolated and format strings). Returns
+    the closed StreamingReportWriter, for its counters.
+
+    Wall time per phase (walk, extract, report, translate) and file and span
+    counters are recorded in ``metrics``. A ``profiler`` (cProfile.Profile)
+    is enabled only while files are being extracted; pass ``workers=1`` so
+    the extraction runs in this process where it can be seen.
+    """
+    metrics = metrics or Metrics()
+    with StreamingReportWriter(report_csv, translator=engine, resume=resume,
+                               metrics=metrics) as report:
+        paths = metrics.timed("walk", discover_files(project_path, tuple(extensions), set(ignore_dirs)))
+        if report.done_files:
+            metrics.count("files_skipped_total", len(report.done_files), reason="resume")
+            paths = (path for path in paths if path not in report.done_files)
+            if manifest is not None:
+                # Skipped, not deleted: their cached spans must survive save()
+                manifest.keep(report.done_files)
+        results = scan_files(paths, workers=workers, manifest=manifest)
+        for path, spans, file_hash in metrics.timed("extract", results, profiler):
+            metrics.count("files_scanned_total")
+            rows = []
+            kinds = Counter()
+            for span in spans:
+                if skip_emails and span.kind == CONFIG_VALUE and EMAIL_REGEX.match(span.text):
+                    continue
+                if skip_patterns and any(pattern in span.text for pattern in skip_patterns):
+                    continue
+                kinds[span.kind] += 1
+                rows.append(ReportRow(path, span.line, span.column, span.start, span.end,
+                                      span.text, "", file_hash))
+            if not rows:
+                metrics.count("files_skipped_total", reason="no_japanese")
+            for kind, count in kinds.items():
+                metrics.count("spans_total", count, kind=kind)
+            if engine is not None:
+                # Memory lookups, submits and collecting finished batches
+                with metrics.phase("translate"):
+                    for row in rows:
+                        engine.add(row.japanese_text)
+            with metrics.phase("report"):
+                report.add_file(path, rows)
+        if manifest is not None:
+            manifest.save()
+            metrics.count("scan_cache_total", manifest.reused, result="hit")
+            metrics.count("scan_cache_total", manifest.extracted, result="miss")
+        if engine is not None:
+            # Translate whatever is still pending; the writer flushes the rest on close
+            with metrics.phase("translate"):
+                engine.translate_all()
+    return report
+
+
+# =============================
+# TRANSLATE
+# =============================
+def needs_translation(row):
+    return not row["english_text"] or row["english_text"] == row["japanese_text"]
+
+
+def translate_report(report_csv, engine, metrics=None):
+    """Fill in missing English in an existing report; returns rows written.
+
+    Rows that already have a translation (e.g. corrected during review) are
+    kept as they are. Rows whose English equals the Japanese, left by a
+    failed batch, are translated again.
+    """
+    metrics = metrics or Metrics()
+    with metrics.phase("translate"):
+        for row in read_report(report_csv):
+            if needs_translation(row):
+                engine.add(row["japanese_text"])
+        engine.translate_all()
+
+    # Stream the report into an updated copy, then swap it in
+    tmp_path = report_csv + ".tmp"
+    with metrics.phase("report"), StreamingReportWriter(tmp_path) as updated:
+        for path, rows in groupby(read_report(report_csv), key=lambda row: row["file"]):
+            file_rows = []
+            for row in rows:
+                if needs_translation(row):
+                    text = row["japanese_text"]
+                    row["english_text"] = engine.translations.get(text, text)
+                file_rows.append(report_row(row))
+            updated.add_file(path, file_rows)
+    os.replace(tmp_path, report_csv)
+    return updated.rows_written
@@ -0,0 +1,47 @@
+import mmap
+import re
+
+# =============================
+# BYTE-LEVEL JAPANESE DETECTION
+# =============================
+# UTF-8 encodings of the Japanese ranges the extractors report:
+#   U+3040-U+30FF (kana)  -> E3 81 80 .. E3 83 BF
+#   U+4E00-U+9FAF (kanji) -> E4 B8 80 .. E9 BE AF
+# A file without one of these byte sequences cannot produce any report rows.
+JAPANESE_BYTES_REGEX = re.compile(
+    rb'\xe3[\x81-\x83][\x80-\xbf]'
+    rb'|\xe4[\xb8-\xbf][\x80-\xbf]'
+    rb'|[\xe5-\xe9][\x80-\xbf][\x80-\xbf]'
+)
+
+
+# Every match starts with one of these lead bytes. find() on a single byte
+# is a memchr, an order of magnitude faster than the regex over ASCII text.
+LEAD_BYTES = [bytes([lead]) for lead in range(0xE3, 0xEA)]
+
+
+def contains_japanese_bytes(buffer, start=0, end=None):
+    """True if the UTF-8 ``buffer`` (bytes or mmap) contains any Japanese.
+
+    The regex only runs from the first lead byte on, so a file without one
+    is rejected after a few memchr passes.
+    """
+    if end is None:
+        end = len(buffer)
+    first = min((pos for pos in (buffer.find(lead, start, end) for lead in LEAD_BYTES)
+                 if pos >= 0), default=-1)
+    if first < 0:
+        return False
+    return JAPANESE_BYTES_REGEX.search(buffer, first, end) is not None
+
+
+def file_has_japanese(path):
+    """Check a file for Japanese without reading it into memory or decoding it."""
+    with open(path, "rb") as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return contains_japanese_bytes(mm)
+        except ValueError:
+            # Empty files cannot be mapped
+            return False
+
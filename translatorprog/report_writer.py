@@ -0,0 +1,147 @@
+import csv
+import os
+from collections import deque, namedtuple
+from contextlib import nullcontext
+
+# =============================
+# REPORT ROWS
+# =============================
+# ``start``/``end`` are the span's byte offsets in the scanned file; apply
+# splices on them. ``line_number``/``column`` are for reviewers.
+REPORT_FIELDS = ["file", "line_number", "column", "start", "end",
+                 "japanese_text", "english_text", "file_hash"]
+
+ReportRow = namedtuple("ReportRow", REPORT_FIELDS)
+
+BATCH_SIZE = 1000   # rows buffered before the writer tries to flush
+
+
+def read_report(path):
+    """Yield report rows as dicts, e.g. to apply a reviewed CSV."""
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        yield from csv.DictReader(f)
+
+
+def report_row(row):
+    """ReportRow from a read_report() dict; columns older reports lack are left empty."""
+    return ReportRow(**{field: row.get(field) or "" for field in REPORT_FIELDS})
+
+
+# =============================
+# STREAMING WRITER
+# =============================
+class StreamingReportWriter:
+    """Writes report rows to CSV in batches while the scan is still running.
+
+    Rows are handed over one file at a time with ``add_file()``; duplicates
+    within the file are dropped on the way in, so only a per-file key set is
+    ever held. When a ``translator`` (a BatchTranslator) is given, a file's
+    rows are written once all of its texts are translated; files are always
+    written whole and in scan order. If twice ``batch_size`` rows pile up
+    waiting, the translator's partial batch is sent and awaited so memory
+    stays bounded.
+
+    With ``resume=True`` an existing report is kept and the files already in
+    it are listed in ``done_files`` so the scan can skip them. The last file
+    in the old report may have been cut off by the crash, so its rows are
+    dropped and it is scanned again.
+
+    With ``metrics`` (see metrics.py), time spent waiting for the translator
+    is charged to the "translate" phase.
+    """
+
+    def __init__(self, path, translator=None, batch_size=BATCH_SIZE, resume=False, metrics=None):
+        self.path = path
+        self.translator = translator
+        self.translations = translator.translations if translator is not None else None
+        self.batch_size = batch_size
+        self.metrics = metrics
+        self.pending = deque()      # (file, rows) waiting for translations
+        self.pending_rows = 0
+        self.done_files = set()
+        self.rows_written = 0
+
+        if resume and os.path.exists(path):
+            self.done_files, self.rows_written = self.truncate_last_file()
+            self.f = open(path, "a", newline="", encoding="utf-8")
+            self.writer = csv.writer(self.f)
+        else:
+            self.f = open(path, "w", newline="", encoding="utf-8")
+            self.writer = csv.writer(self.f)
+            self.writer.writerow(REPORT_FIELDS)
+
+    def truncate_last_file(self):
+        """Rewrite the report without its last file's rows; return (files, rows)."""
+        last_file = None
+        for row in read_report(self.path):
+            last_file = row["file"]
+
+        files, kept = set(), 0
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=REPORT_FIELDS, extrasaction="ignore")
+            writer.writeheader()
+            for row in read_report(self.path):
+                if row["file"] != last_file:
+                    writer.writerow(row)
+                    files.add(row["file"])
+                    kept += 1
+        os.replace(tmp_path, self.path)
+        return files, kept
+
+    def add_file(self, path, rows):
+        """Queue one file's rows, dropping duplicates of (line, column, text)."""
+        seen = set()
+        unique = []
+        for row in rows:
+            key = (row.line_number, row.column, row.japanese_text)
+            if key not in seen:
+                seen.add(key)
+                unique.append(row)
+        if unique:
+            self.pending.append((path, unique))
+            self.pending_rows += len(unique)
+        if self.pending_rows >= self.batch_size:
+            self.flush()
+        if self.pending_rows >= 2 * self.batch_size and self.translator is not None:
+            with self.metrics.phase("translate") if self.metrics else nullcontext():
+                self.translator.submit_pending(final=True)
+                self.translator.collect(block=True)
+            self.flush()
+
+    def translated(self, rows):
+        return all(row.japanese_text in self.translations for row in rows)
+
+    def flush(self, final=False):
+        """Write every leading queued file that is ready (all of them if ``final``)."""
+        written = 0
+        while self.pending:
+            path, rows = self.pending[0]
+            if self.translations is not None:
+                if not final and not self.translated(rows):
+                    break
+                rows = [row._replace(english_text=self.translations.get(row.japanese_text,
+                                                                        row.japanese_text))
+                        for row in rows]
+            self.writer.writerows(rows)
+            self.pending.popleft()
+            self.pending_rows -= len(rows)
+            written += len(rows)
+        if written:
+            self.rows_written += written
+            self.f.flush()
+
+    def close(self):
+        self.flush(final=True)
+        self.f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            # Keep only what is really translated so a resumed run redoes the rest
+            self.flush()
+            self.f.close()
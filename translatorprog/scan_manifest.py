@@ -0,0 +1,78 @@
+import json
+import os
+
+from .extractors import EXTRACTOR_VERSION, Span
+
+# =============================
+# SCAN MANIFEST
+# =============================
+class ScanManifest:
+    """Per-file size, mtime, content hash and extracted spans from the last scan.
+
+    Stored as JSON next to the report CSV. On the next run a file whose size
+    and mtime are unchanged reuses its cached spans without being opened; a
+    file whose stat changed but whose SHA-256 still matches (e.g. after a
+    checkout) reuses them after hashing; only genuinely changed files are
+    re-extracted. The whole manifest is discarded when EXTRACTOR_VERSION
+    changes.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self.seen = set()
+        self.reused = 0
+        self.extracted = 0
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("extractor_version") == EXTRACTOR_VERSION:
+                self.entries = data["files"]
+
+    @staticmethod
+    def path_for(report_csv):
+        return os.path.splitext(report_csv)[0] + ".manifest.json"
+
+    def cached_spans(self, path, stat):
+        """Spans for ``path`` if its size and mtime match the manifest."""
+        entry = self.entries.get(path)
+        if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            self.seen.add(path)
+            self.reused += 1
+            return [Span(*span) for span in entry["spans"]]
+        return None
+
+    def known_hash(self, path):
+        entry = self.entries.get(path)
+        return entry["sha256"] if entry else None
+
+    def reuse(self, path, size, mtime_ns):
+        """Content hash matched: refresh the stat and return the cached spans."""
+        entry = self.entries[path]
+        entry["size"], entry["mtime_ns"] = size, mtime_ns
+        self.seen.add(path)
+        self.reused += 1
+        return [Span(*span) for span in entry["spans"]]
+
+    def update(self, path, size, mtime_ns, sha256, spans):
+        self.entries[path] = {
+            "size": size,
+            "mtime_ns": mtime_ns,
+            "sha256": sha256,
+            "spans": [list(span) for span in spans],
+        }
+        self.seen.add(path)
+        self.extracted += 1
+
+    def keep(self, paths):
+        """Keep the entries of ``paths`` although this run does not scan them."""
+        self.seen.update(path for path in paths if path in self.entries)
+
+    def save(self):
+        """Write the manifest atomically, dropping files not seen this run."""
+        files = {path: self.entries[path] for path in sorted(self.seen)}
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"extractor_version": EXTRACTOR_VERSION, "files": files},
+                      f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,130 @@
+import hashlib
+import mmap
+import os
+from collections import deque
+
+from .extractors import extract_buffer_spans
+from .prefilter import contains_japanese_bytes
+
+# =============================
+# CONFIGURATION
+# =============================
+CHUNK_SIZE = 64   # files handed to a worker process at a time
+
+
+# =============================
+# STAGE 1: DISCOVERY
+# =============================
+def discover_files(project_path, extensions, ignore_dirs=()):
+    """Yield every file to scan, in sorted order so reports stay diff-stable."""
+    for root, dirs, files in os.walk(project_path):
+        dirs[:] = sorted(d for d in dirs if d not in ignore_dirs)
+        for file in sorted(files):
+            if file.endswith(extensions):
+                yield os.path.join(root, file)
+
+
+# =============================
+# STAGE 2: EXTRACTION
+# =============================
+def extract_file(path, known_hash=None, prefilter=True):
+    """Read one file and return (path, spans, (size, mtime_ns, sha256)).
+
+    ``spans`` is None when the content hash equals ``known_hash``, meaning
+    the caller can reuse the spans it already has. The file is memory-mapped
+    and lexed in place; only the text of spans containing Japanese is
+    decoded, so even a tens-of-MB bundle is never held as a str. With
+    ``prefilter``, a file whose bytes contain no Japanese is not lexed at all.
+    """
+    with open(path, "rb") as f:
+        stat = os.fstat(f.fileno())
+        if stat.st_size == 0:
+            return path, [], (0, stat.st_mtime_ns, hashlib.sha256(b"").hexdigest())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            digest = hashlib.sha256(mm).hexdigest()
+            info = (stat.st_size, stat.st_mtime_ns, digest)
+            if digest == known_hash:
+                return path, None, info
+            if prefilter and not contains_japanese_bytes(mm):
+                return path, [], info
+            return path, list(extract_buffer_spans(mm, path)), info
+
+
+def extract_chunk(items, prefilter=True):
+    return [extract_file(path, known_hash, prefilter) for path, known_hash in items]
+
+
+def chunked(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def scan_files(paths, workers=None, chunk_size=CHUNK_SIZE, manifest=None, prefilter=True):
+    """Extract spans from ``paths`` on a process pool.
+
+    Yields (path, spans, sha256); the hash is of the file content the spans
+    were extracted from, so the apply phase can detect later edits.
+
+    Results are streamed back in the same order as ``paths`` regardless of
+    which worker finishes first. At most two chunks per worker are in flight,
+    so discovery and extraction overlap without buffering the whole tree.
+    ``workers=1`` extracts in the calling process.
+
+    With a ScanManifest, files whose size and mtime are unchanged are served
+    from it without being read, and the manifest is updated with everything
+    that was (re-)extracted. The caller saves it.
+
+    ``prefilter=False`` lexes every file even when it has no Japanese bytes.
+    """
+    def plan(chunk):
+        """Split a chunk into cached results and files a worker must read."""
+        cached, todo = {}, []
+        for path in chunk:
+            spans = None
+            if manifest is not None:
+                spans = manifest.cached_spans(path, os.stat(path))
+            if spans is None:
+                todo.append((path, manifest.known_hash(path) if manifest else None))
+            else:
+                cached[path] = spans, manifest.known_hash(path)
+        return chunk, cached, todo
+
+    def merge(chunk, cached, results):
+        """Yield a chunk's results in path order, recording fresh extractions."""
+        for path, spans, (size, mtime_ns, digest) in results:
+            if manifest is not None:
+                if spans is None:
+                    spans = manifest.reuse(path, size, mtime_ns)
+                else:
+                    manifest.update(path, size, mtime_ns, digest, spans)
+            cached[path] = spans, digest
+        for path in chunk:
+            yield (path, *cached[path])
+
+    if workers == 1:
+        for chunk in chunked(paths, chunk_size):
+            chunk, cached, todo = plan(chunk)
+            yield from merge(chunk, cached, extract_chunk(todo, prefilter))
+        return
+
+    # Imported here so single-process scans never load multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        inflight = deque()
+        for chunk in chunked(paths, chunk_size):
+            chunk, cached, todo = plan(chunk)
+            inflight.append((chunk, cached, pool.submit(extract_chunk, todo, prefilter) if todo else None))
+            if len(inflight) >= workers * 2:
+                chunk, cached, future = inflight.popleft()
+                yield from merge(chunk, cached, future.result() if future else [])
+        while inflight:
+            chunk, cached, future = inflight.popleft()
+            yield from merge(chunk, cached, future.result() if future else [])
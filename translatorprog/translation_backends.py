@@ -0,0 +1,186 @@
+import random
+import threading
+import time
+from collections import namedtuple
+
+# =============================
+# BACKEND INTERFACE
+# =============================
+# ``character_limit`` is None when the backend has no quota.
+Usage = namedtuple("Usage", ["character_count", "character_limit"])
+
+
+class RateLimitError(Exception):
+    """The backend asked us to slow down (HTTP 429 or equivalent)."""
+
+    def __init__(self, message="Too many requests", retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def is_rate_limited(exc) -> bool:
+    """True for DeepL's TooManyRequestsException or any HTTP 429 error."""
+    return (isinstance(exc, RateLimitError)
+            or type(exc).__name__ == "TooManyRequestsException"
+            or getattr(exc, "http_status_code", None) == 429)
+
+
+class TranslationBackend:
+    """What BatchTranslator needs from a translation engine.
+
+    ``translate_batch`` returns one translated string per input text, in
+    order, and raises RateLimitError when throttled so the caller can back
+    off. It is called from several worker threads at once.
+    """
+
+    name = None
+
+    def translate_batch(self, texts, source_lang, target_lang):
+        raise NotImplementedError
+
+    def usage(self):
+        """Characters used and the quota, as a Usage."""
+        raise NotImplementedError
+
+    def supported_languages(self):
+        """Target language codes this backend can produce."""
+        raise NotImplementedError
+
+
+# =============================
+# DEEPL
+# =============================
+class DeepLBackend(TranslationBackend):
+    """DeepL via the official ``deepl`` package, imported only when used.
+
+    An existing DeepL-style ``client`` (anything with ``translate_text``)
+    can be wrapped instead, e.g. one pointed at the mock server.
+    """
+
+    name = "deepl"
+
+    def __init__(self, auth_key=None, client=None, **options):
+        if client is None:
+            import deepl
+            client = deepl.Translator(auth_key, **options)
+        self.client = client
+
+    def translate_batch(self, texts, source_lang, target_lang):
+        try:
+            results = self.client.translate_text(texts, source_lang=source_lang,
+                                                 target_lang=target_lang)
+        except Exception as e:
+            if is_rate_limited(e):
+                raise RateLimitError(str(e), getattr(e, "retry_after", None)) from e
+            raise
+        return [result.text for result in results]
+
+    def usage(self):
+        usage = self.client.get_usage()
+        return Usage(usage.character.count, usage.character.limit)
+
+    def supported_languages(self):
+        return [language.code for language in self.client.get_target_languages()]
+
+
+# =============================
+# TRANSLATION MEMORY ONLY
+# =============================
+class MemoryBackend(TranslationBackend):
+    """Answers from a dict or TranslationMemory and never calls an API.
+
+    Texts that are not known come back unchanged, which the report and the
+    apply phase treat as untranslated; ``misses`` counts them.
+    """
+
+    name = "memory"
+
+    def __init__(self, memory):
+        self.memory = memory
+        self.misses = 0
+        self.characters = 0
+        self.lock = threading.Lock()
+
+    def translate_batch(self, texts, source_lang, target_lang):
+        if isinstance(self.memory, dict):
+            found = {text: self.memory[text] for text in texts if text in self.memory}
+        else:
+            found = self.memory.lookup_many(texts, source_lang, target_lang)
+        with self.lock:
+            self.misses += sum(1 for text in texts if text not in found)
+            self.characters += sum(len(text) for text in texts)
+        return [found.get(text, text) for text in texts]
+
+    def usage(self):
+        return Usage(self.characters, None)
+
+    def supported_languages(self):
+        if isinstance(self.memory, dict):
+            return []
+        rows = self.memory.conn.execute("SELECT DISTINCT target_lang FROM translations")
+        return [row[0] for row in rows]
+
+
+# =============================
+# DETERMINISTIC FAKE
+# =============================
+class FakeBackend(TranslationBackend):
+    """Offline stand-in for benchmarks and CI.
+
+    Each call sleeps ``latency`` seconds plus ``latency_per_text`` per text,
+    then returns ``"[<target_lang>] <text>"`` for every input. A seeded
+    generator throttles a ``rate_429`` fraction of calls, so runs with the
+    same seed see the same sequence of rate-limit errors.
+    """
+
+    name = "fake"
+    LANGUAGES = ["DE", "EN-GB", "EN-US", "FR", "JA", "KO", "ZH"]
+
+    def __init__(self, latency=0.05, latency_per_text=0.0, rate_429=0.0,
+                 retry_after=None, seed=0, character_limit=None):
+        self.latency = latency
+        self.latency_per_text = latency_per_text
+        self.rate_429 = rate_429
+        self.retry_after = retry_after
+        self.character_limit = character_limit
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.characters = 0
+        self.calls = 0
+        self.throttled = 0
+
+    def translate_batch(self, texts, source_lang, target_lang):
+        with self.lock:
+            self.calls += 1
+            throttle = self.rate_429 and self.random.random() < self.rate_429
+            if throttle:
+                self.throttled += 1
+            else:
+                self.characters += sum(len(text) for text in texts)
+        time.sleep(self.latency + self.latency_per_text * len(texts))
+        if throttle:
+            raise RateLimitError(retry_after=self.retry_after)
+        return [f"[{target_lang}] {text}" for text in texts]
+
+    def usage(self):
+        return Usage(self.characters, self.character_limit)
+
+    def supported_languages(self):
+        return list(self.LANGUAGES)
+
+
+# =============================
+# FACTORY
+# =============================
+BACKENDS = ("deepl", "memory", "fake")
+
+
+def create_backend(name, auth_key=None, memory=None):
+    """Build a backend from a script's TRANSLATION_BACKEND setting."""
+    if name == "deepl":
+        return DeepLBackend(auth_key)
+    if name == "memory":
+        return MemoryBackend(memory if memory is not None else {})
+    if name == "fake":
+        return FakeBackend()
+    raise ValueError(f"Unknown translation backend {name!r}; choose one of {', '.join(BACKENDS)}")
@@ -0,0 +1,269 @@
+import random
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from .translation_backends import DeepLBackend, RateLimitError
+
+# =============================
+# CONFIGURATION
+# =============================
+# DeepL accepts at most 50 texts per request and rejects request bodies
+# over 128 KiB, so batches are cut on whichever limit is reached first.
+MAX_BATCH_TEXTS = 50
+MAX_BATCH_BYTES = 100 * 1024
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_REQUESTS_PER_SECOND = 5.0
+MAX_RETRIES = 6
+BACKOFF_BASE = 1.0      # seconds, doubled on every retry
+BACKOFF_CAP = 60.0
+
+
+# =============================
+# POST-PROCESSING
+# =============================
+# Bump POSTPROCESS_VERSION whenever postprocess() changes so stale entries in
+# the translation memory are not reused.
+POSTPROCESS_VERSION = 1
+PUNCTUATION_MAP = {"。": ".", "：": ":"}
+PUNCTUATION_REGEX = re.compile("|".join(map(re.escape, PUNCTUATION_MAP)))
+
+
+def postprocess(text: str) -> str:
+    """Replace full-width punctuation DeepL leaves behind."""
+    return PUNCTUATION_REGEX.sub(lambda m: PUNCTUATION_MAP[m.group(0)], text)
+
+
+# =============================
+# RATE LIMITING
+# =============================
+class TokenBucket:
+    """Thread-safe token bucket shared by all translation workers.
+
+    ``backoff()`` pauses every worker, not just the one that was throttled,
+    so a 429 from DeepL slows the whole pool down instead of letting the
+    other workers keep hammering the API.
+    """
+
+    def __init__(self, rate=DEFAULT_REQUESTS_PER_SECOND, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if now >= self.paused_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait_for = max(self.paused_until - now, (1 - self.tokens) / self.rate)
+            time.sleep(wait_for)
+
+    def backoff(self, delay):
+        with self.lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + delay)
+            self.tokens = 0
+
+
+def retry_delay(exc, attempt):
+    """Exponential backoff with full jitter, honouring Retry-After if present."""
+    retry_after = getattr(exc, "retry_after", None)
+    if retry_after:
+        return float(retry_after) + random.uniform(0, BACKOFF_BASE)
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+
+# =============================
+# BATCH TRANSLATOR
+# =============================
+class BatchTranslator:
+    """Collects unique strings during a scan and translates them in batches.
+
+    ``backend`` is a TranslationBackend (see translation_backends.py), so
+    DeepL, a translation-memory-only backend or an offline fake can be
+    swapped in without touching the scanners. A bare DeepL-style client with
+    ``translate_text`` (e.g. ``deepl.Translator``) is wrapped in a
+    DeepLBackend.
+
+    Full batches are handed to a pool of ``concurrency`` worker threads as
+    soon as they fill up, so the scan keeps going while requests are in
+    flight. Workers share a TokenBucket and retry 429 responses with
+    jittered exponential backoff.
+
+    When a ``memory`` (see translation_memory.py) is given, each batch is
+    looked up in bulk before any request is sent and new translations are
+    written back to it.
+
+    With ``metrics`` (see metrics.py), every request's latency, outcome and
+    billed characters are recorded, as are translation memory hits and
+    misses.
+    """
+
+    def __init__(self, backend, source_lang="JA", target_lang="EN-US",
+                 max_texts=MAX_BATCH_TEXTS, max_bytes=MAX_BATCH_BYTES,
+                 postprocess=postprocess, memory=None,
+                 concurrency=DEFAULT_CONCURRENCY, rate_limit=DEFAULT_REQUESTS_PER_SECOND,
+                 max_retries=MAX_RETRIES, metrics=None):
+        if not hasattr(backend, "translate_batch"):
+            backend = DeepLBackend(client=backend)
+        self.backend = backend
+        self.source_lang = source_lang
+        self.target_lang = target_lang
+        self.max_texts = max_texts
+        self.max_bytes = max_bytes
+        self.postprocess = postprocess
+        self.memory = memory
+        self.max_retries = max_retries
+        self.metrics = metrics
+        self.bucket = TokenBucket(rate_limit)
+        self.executor = ThreadPoolExecutor(max_workers=concurrency,
+                                           thread_name_prefix="translate")
+        self.pending = {}       # insertion-ordered set of untranslated texts
+        self.pending_bytes = 0
+        self.inflight = set()
+        self.futures = set()
+        self.translations = {}
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.retries = 0
+        self.memory_hits = 0
+
+    def add(self, text: str):
+        """Register a text for translation; duplicates are ignored.
+
+        Submits a batch in the background once enough texts are pending.
+        """
+        if text in self.translations or text in self.pending or text in self.inflight:
+            return
+        self.pending[text] = None
+        self.pending_bytes += len(text.encode("utf-8"))
+        if len(self.pending) >= self.max_texts or self.pending_bytes >= self.max_bytes:
+            self.submit_pending(final=False)
+        if self.futures:
+            self.collect(block=False)
+
+    def batches(self):
+        """Yield pending texts in batches sized by count and UTF-8 bytes."""
+        batch, batch_bytes = [], 0
+        for text in self.pending:
+            size = len(text.encode("utf-8"))
+            if batch and (len(batch) >= self.max_texts or batch_bytes + size > self.max_bytes):
+                yield batch
+                batch, batch_bytes = [], 0
+            batch.append(text)
+            batch_bytes += size
+        if batch:
+            yield batch
+
+    def submit_pending(self, final=True):
+        """Send pending batches to the worker pool.
+
+        Unless ``final`` is set, a trailing batch that is not yet full stays
+        pending so later texts can still join it.
+        """
+        batches = list(self.batches())
+        if not final and batches and len(batches[-1]) < self.max_texts:
+            batches.pop()
+        for batch in batches:
+            for text in batch:
+                del self.pending[text]
+                self.pending_bytes -= len(text.encode("utf-8"))
+            self.submit(batch)
+
+    def submit(self, batch):
+        if self.memory is not None:
+            hits = self.memory.lookup_many(batch, self.source_lang, self.target_lang)
+            self.translations.update(hits)
+            self.memory_hits += len(hits)
+            if self.metrics is not None:
+                self.metrics.count("translation_memory_lookups_total", len(hits), result="hit")
+                self.metrics.count("translation_memory_lookups_total", len(batch) - len(hits),
+                                   result="miss")
+            batch = [text for text in batch if text not in hits]
+        if batch:
+            self.inflight.update(batch)
+            self.futures.add(self.executor.submit(self.translate_batch, batch))
+
+    def request(self, batch):
+        """Send one request, retrying rate-limit errors with backoff."""
+        for attempt in range(self.max_retries + 1):
+            self.bucket.acquire()
+            with self.lock:
+                self.requests += 1
+            start = time.perf_counter()
+            try:
+                results = self.backend.translate_batch(batch, self.source_lang, self.target_lang)
+            except RateLimitError as e:
+                self.record(start, "rate_limited")
+                if attempt == self.max_retries:
+                    raise
+                delay = retry_delay(e, attempt)
+                self.bucket.backoff(delay)
+                with self.lock:
+                    self.retries += 1
+                time.sleep(delay)
+            except Exception:
+                self.record(start, "error")
+                raise
+            else:
+                self.record(start, "ok", sum(len(text) for text in batch))
+                return results
+
+    def record(self, start, outcome, characters=0):
+        """Report one API call's latency and outcome to ``metrics``."""
+        if self.metrics is None:
+            return
+        backend = self.backend.name or type(self.backend).__name__
+        self.metrics.observe("translation_request_seconds", time.perf_counter() - start,
+                             backend=backend)
+        self.metrics.count("translation_requests_total", backend=backend, outcome=outcome)
+        if characters:
+            self.metrics.count("translation_characters_total", characters, backend=backend)
+
+    def translate_batch(self, batch):
+        """Worker body: returns (batch, translations) or (batch, None) on failure."""
+        try:
+            translated = [self.postprocess(text) for text in self.request(batch)]
+        except Exception as e:
+            print(f"Translation failed for batch of {len(batch)} texts: {e}")
+            return batch, None
+        if self.memory is not None:
+            # Texts that came back unchanged (e.g. misses of a memory-only
+            # backend) are not real translations
+            pairs = [(src, dst) for src, dst in zip(batch, translated) if dst != src]
+            self.memory.store_many(pairs, self.source_lang, self.target_lang)
+        return batch, translated
+
+    def collect(self, block=True):
+        """Merge finished batches into ``translations``.
+
+        Texts whose batch failed fall back to the source text and are not
+        written to the translation memory.
+        """
+        while self.futures:
+            done, self.futures = wait(self.futures, timeout=None if block else 0,
+                                      return_when=FIRST_COMPLETED)
+            for future in done:
+                batch, translated = future.result()
+                for text, result in zip(batch, translated or batch):
+                    self.translations[text] = result
+                    self.inflight.discard(text)
+            if not block:
+                break
+
+    def translate_all(self):
+        """Translate every pending text and return the full translation map."""
+        self.submit_pending(final=True)
+        self.collect(block=True)
+        return self.translations
+
+    def close(self):
+        self.executor.shutdown(wait=True)
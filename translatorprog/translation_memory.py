@@ -0,0 +1,125 @@
+import csv
+import sqlite3
+import sys
+import threading
+
+from .translation_engine import POSTPROCESS_VERSION
+
+# =============================
+# CONFIGURATION
+# =============================
+DEFAULT_PATH = "translation_memory.sqlite3"
+
+# Version under which translations are stored exactly as the backend
+# returned them, i.e. with post-processing turned off.
+RAW_VERSION = 0
+
+# SQLite caps the number of bound parameters per statement (999 on older
+# builds), so bulk lookups are split into chunks below that limit.
+LOOKUP_CHUNK = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS translations (
+    source_text TEXT NOT NULL,
+    source_lang TEXT NOT NULL,
+    target_lang TEXT NOT NULL,
+    version     INTEGER NOT NULL,
+    target_text TEXT NOT NULL,
+    PRIMARY KEY (source_text, source_lang, target_lang, version)
+)
+"""
+
+
+# =============================
+# TRANSLATION MEMORY
+# =============================
+class TranslationMemory:
+    """Persistent translation cache shared across runs and projects.
+
+    Entries are keyed by (source text, source lang, target lang,
+    post-processing version). The database runs in WAL mode with a busy
+    timeout and every write is a short ``BEGIN IMMEDIATE`` transaction, so
+    several scanner processes can share one file.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, version=POSTPROCESS_VERSION, timeout=30.0):
+        self.path = path
+        self.version = version
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=timeout, isolation_level=None,
+                                    check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def lookup_many(self, texts, source_lang, target_lang):
+        """Return {source_text: target_text} for every text already stored."""
+        texts = list(dict.fromkeys(texts))
+        found = {}
+        with self.lock:
+            for i in range(0, len(texts), LOOKUP_CHUNK):
+                chunk = texts[i:i + LOOKUP_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                cursor = self.conn.execute(
+                    "SELECT source_text, target_text FROM translations"
+                    " WHERE source_lang = ? AND target_lang = ? AND version = ?"
+                    f" AND source_text IN ({placeholders})",
+                    [source_lang or "", target_lang, self.version, *chunk]
+                )
+                found.update(cursor.fetchall())
+        return found
+
+    def store_many(self, pairs, source_lang, target_lang):
+        """Insert or update (source_text, target_text) pairs in one transaction."""
+        rows = [(src, source_lang or "", target_lang, self.version, dst) for src, dst in pairs]
+        if not rows:
+            return 0
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO translations"
+                    " (source_text, source_lang, target_lang, version, target_text)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    rows
+                )
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    def import_report_csv(self, csv_path, source_lang="JA", target_lang="EN-US"):
+        """Seed the memory from a japanese_report*.csv file.
+
+        Rows without an English column, or whose English text is empty or
+        identical to the source (a failed translation), are skipped.
+        """
+        pairs = {}
+        with open(csv_path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                source = (row.get("japanese_text") or "").strip()
+                target = (row.get("english_text") or "").strip()
+                if source and target and target != source:
+                    pairs[source] = target
+        return self.store_many(pairs.items(), source_lang, target_lang)
+
+
+# =============================
+# SEED FROM EXISTING REPORTS
+# =============================
+if __name__ == "__main__":
+    # Usage: python -m translatorprog.translation_memory japanese_report4.csv japanese_report_flutter.csv
+    with TranslationMemory() as memory:
+        for csv_path in sys.argv[1:]:
+            count = memory.import_report_csv(csv_path)
+            print(f"Imported {count} translations from {csv_path}")
@@ -2,6 +2,8 @@ import os
 import re
 import csv
 
+from translatorprog.prefilter import file_has_japanese
+
 # =============================
 # CONFIGURATION
 # =============================
@@ -27,6 +29,8 @@ for root, dirs, files in os.walk(PROJECT_PATH):
     for file in files:
         if file.endswith(FILE_EXTENSIONS):
             file_path = os.path.join(root, file)
+            if not file_has_japanese(file_path):
+                continue
             with open(file_path, "r", encoding="utf-8") as f:
                 for i, line in enumerate(f, start=1):
                     matches = find_japanese_text(line)